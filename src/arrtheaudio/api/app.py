@@ -93,6 +93,10 @@ async def lifespan(app: FastAPI):
         await app_state.worker_pool.stop()
         logger.info("Worker pool stopped")
 
+    # Close pooled database connections
+    if app_state.queue_manager:
+        app_state.queue_manager.db.close()
+
     logger.info("Shutdown complete")
 
 
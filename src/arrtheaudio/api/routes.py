@@ -2,6 +2,7 @@
 
 import hmac
 import hashlib
+import re
 import time
 import uuid
 from pathlib import Path
@@ -29,20 +30,31 @@ from arrtheaudio.utils.path_mapper import PathMapper
 logger = get_logger(__name__)
 router = APIRouter()
 
+# Lowercase hex of a SHA-256 digest, exactly as hexdigest() produces it
+_SIGNATURE_RE = re.compile(r"[0-9a-f]{64}")
+
 
 def verify_webhook_signature(body: bytes, signature: str, secret: str) -> bool:
     """Verify webhook HMAC signature.
 
+    The hex header is decoded once and compared against the raw 32-byte
+    digest, so no hex string is built for the expected value. Only the
+    exact hexdigest() form is accepted: bytes.fromhex alone would also let
+    through uppercase digits and embedded whitespace.
+
     Args:
         body: Request body bytes
-        signature: Signature from header
+        signature: Hex-encoded signature from header
         secret: Shared secret
 
     Returns:
         True if signature is valid
     """
-    expected = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
-    return hmac.compare_digest(expected, signature)
+    if not _SIGNATURE_RE.fullmatch(signature):
+        return False
+    received = bytes.fromhex(signature)
+    expected = hmac.new(secret.encode(), body, hashlib.sha256).digest()
+    return hmac.compare_digest(expected, received)
 
 
 async def process_file_task(file_path: Path, config, job_id: str, arr_metadata: dict = None):
@@ -145,7 +157,7 @@ async def sonarr_webhook(
 
     # Generate webhook ID to link all jobs
     webhook_id = f"webhook_{uuid.uuid4().hex[:12]}"
-    job_ids = []
+    local_paths = []
     path_mapper = PathMapper(config.path_mappings)
 
     # Process ALL files (fixes critical bug!)
@@ -170,28 +182,31 @@ async def sonarr_webhook(
             )
             continue  # Skip this file, continue with others
 
-        # Submit job to queue
-        from arrtheaudio.core.job_models import JobPriority, JobSource
+        local_paths.append(local_path)
+
+    # Submit all files to the queue in one transaction
+    from arrtheaudio.core.job_models import JobPriority, JobSource
+
+    jobs = await queue_manager.submit_jobs(
+        local_paths,
+        priority=JobPriority.HIGH,  # Webhooks are high priority
+        source=JobSource.SONARR,
+        webhook_id=webhook_id,
+        tmdb_id=payload.series_tmdb_id,
+        original_language=payload.original_language,
+        series_title=payload.series_title,
+    )
 
-        job = await queue_manager.submit_job(
-            file_path=local_path,
-            priority=JobPriority.HIGH,  # Webhooks are high priority
-            source=JobSource.SONARR,
+    job_ids = []
+    for job in jobs:
+        job_ids.append(job.job_id)
+        logger.info(
+            "Job created for file",
             webhook_id=webhook_id,
-            tmdb_id=payload.series_tmdb_id,
-            original_language=payload.original_language,
-            series_title=payload.series_title,
+            job_id=job.job_id,
+            file=job.file_path,
         )
 
-        if job:
-            job_ids.append(job.job_id)
-            logger.info(
-                "Job created for file",
-                webhook_id=webhook_id,
-                job_id=job.job_id,
-                file=str(local_path),
-            )
-
     # Check if any jobs were created
     if not job_ids:
         logger.error(
@@ -1,89 +1,492 @@
 """SQLite database for job queue persistence."""
 
+import queue
 import sqlite3
+import threading
 from contextlib import contextmanager
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Generator, List, Optional
-
-from arrtheaudio.core.job_models import Job, JobStatus, JobPriority
+from typing import Callable, Generator, Iterable, List, Optional, Union
+
+from arrtheaudio.core.job_models import (
+    PRIORITY_CODES,
+    SOURCE_CODES,
+    STATUS_CODES,
+    STATUS_VALUES,
+    Job,
+    JobStatus,
+    to_epoch_us,
+)
 from arrtheaudio.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Applied to every connection; journal_mode=WAL is persistent and is set once
+# in _init_db instead.
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=30000",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA foreign_keys=ON",
+)
+
+# Bumped whenever the stored layout changes; _init_db rebuilds older tables.
+# 0: enum columns stored as TEXT values. 1: enum columns stored as INTEGER codes.
+# 2: timestamps stored as INTEGER microseconds since the Unix epoch.
+SCHEMA_VERSION = 2
+
+QUEUED_CODE = STATUS_CODES[JobStatus.QUEUED.value]
+RUNNING_CODE = STATUS_CODES[JobStatus.RUNNING.value]
+
+# Statuses a job never leaves. Inlined as literals (not bound parameters) so
+# the planner can match queries against idx_jobs_completed_at's WHERE clause.
+FINISHED_CODES = frozenset(
+    STATUS_CODES[status.value]
+    for status in (JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED)
+)
+FINISHED_STATUSES_SQL = ", ".join(str(code) for code in sorted(FINISHED_CODES))
+
+CREATE_JOBS_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS jobs (
+        job_id TEXT PRIMARY KEY,
+        file_path TEXT NOT NULL,
+        container TEXT NOT NULL,
+        status INTEGER NOT NULL,
+        priority INTEGER NOT NULL,
+        source INTEGER NOT NULL,
+        webhook_id TEXT,
+        batch_id TEXT,
+        selected_track_index INTEGER,
+        selected_track_language TEXT,
+        created_at INTEGER NOT NULL,
+        started_at INTEGER,
+        completed_at INTEGER,
+        success INTEGER,
+        error_message TEXT,
+        retry_count INTEGER DEFAULT 0,
+        tmdb_id INTEGER,
+        original_language TEXT,
+        series_title TEXT,
+        movie_title TEXT
+    )
+"""
+
+# Column order matches Job.to_db_dict(). Statements are fixed strings with
+# named parameters, so a job dict binds directly and sqlite3's per-connection
+# statement cache reuses the prepared statement on every call.
+JOB_COLUMNS = (
+    "job_id",
+    "file_path",
+    "container",
+    "status",
+    "priority",
+    "source",
+    "webhook_id",
+    "batch_id",
+    "selected_track_index",
+    "selected_track_language",
+    "created_at",
+    "started_at",
+    "completed_at",
+    "success",
+    "error_message",
+    "retry_count",
+    "tmdb_id",
+    "original_language",
+    "series_title",
+    "movie_title",
+)
+
+INSERT_JOB_SQL = (
+    f"INSERT INTO jobs ({', '.join(JOB_COLUMNS)}) "
+    f"VALUES ({', '.join(':' + column for column in JOB_COLUMNS)})"
+)
+UPDATE_JOB_SQL = (
+    f"UPDATE jobs SET {', '.join(f'{column} = :{column}' for column in JOB_COLUMNS[1:])} "
+    "WHERE job_id = :job_id"
+)
+# NULL parameters leave the stored value unchanged
+UPDATE_JOB_STATUS_SQL = (
+    "UPDATE jobs SET status = :status, "
+    "started_at = COALESCE(:started_at, started_at), "
+    "completed_at = COALESCE(:completed_at, completed_at), "
+    "success = COALESCE(:success, success) "
+    "WHERE job_id = :job_id"
+)
+DELETE_JOB_SQL = "DELETE FROM jobs WHERE job_id = ?"
+
+
+def _text_to_code_sql(codes: dict) -> Callable[[str], str]:
+    """Build a converter from a TEXT enum value expression to its integer code."""
+    whens = " ".join(f"WHEN '{value}' THEN {code}" for value, code in codes.items())
+    return lambda expr: f"CASE {expr} {whens} END"
+
+
+def _isoformat_to_epoch_us_sql(expr: str) -> str:
+    """Convert an isoformat() timestamp expression to epoch microseconds.
+
+    isoformat() writes fractional seconds as exactly six digits after
+    position 20 (or none at all), so they are read as an integer instead of
+    going through floating point.
+    """
+    return (
+        f"CAST(strftime('%s', {expr}) AS INTEGER) * 1000000 "
+        f"+ CAST(substr({expr}, 21, 6) AS INTEGER)"
+    )
+
+
+# Column conversions applied when upgrading from each schema version to the next
+_UPGRADES: dict[int, dict[str, Callable[[str], str]]] = {
+    0: {
+        "status": _text_to_code_sql(STATUS_CODES),
+        "priority": _text_to_code_sql(PRIORITY_CODES),
+        "source": _text_to_code_sql(SOURCE_CODES),
+    },
+    1: {
+        "created_at": _isoformat_to_epoch_us_sql,
+        "started_at": _isoformat_to_epoch_us_sql,
+        "completed_at": _isoformat_to_epoch_us_sql,
+    },
+}
+
+
+def _migrate_sql(version: int) -> str:
+    """Build the statement copying an older table (renamed to jobs_old) into jobs.
+
+    Args:
+        version: Schema version of jobs_old
+
+    Returns:
+        INSERT ... SELECT statement
+    """
+    expressions = []
+    for column in JOB_COLUMNS:
+        expr = column
+        for step in range(version, SCHEMA_VERSION):
+            convert = _UPGRADES[step].get(column)
+            if convert:
+                expr = convert(expr)
+        expressions.append(expr)
+
+    return (
+        f"INSERT INTO jobs ({', '.join(JOB_COLUMNS)}) "
+        f"SELECT {', '.join(expressions)} FROM jobs_old"
+    )
+
+
+# Job reads list JOB_COLUMNS explicitly so rows unpack positionally into
+# Job.from_db_row whatever the physical column order of the table.
+_SELECT_JOBS = f"SELECT {', '.join(JOB_COLUMNS)} FROM jobs"
+SELECT_JOB_SQL = f"{_SELECT_JOBS} WHERE job_id = ?"
+SELECT_NEXT_JOB_SQL = (
+    f"{_SELECT_JOBS} WHERE status = ? ORDER BY priority DESC, created_at ASC LIMIT 1"
+)
+SELECT_JOBS_BY_STATUS_SQL = f"{_SELECT_JOBS} WHERE status = ? ORDER BY created_at DESC"
+SELECT_JOBS_BY_WEBHOOK_SQL = f"{_SELECT_JOBS} WHERE webhook_id = ? ORDER BY created_at ASC"
+SELECT_JOBS_BY_BATCH_SQL = f"{_SELECT_JOBS} WHERE batch_id = ? ORDER BY created_at ASC"
+DELETE_FINISHED_BEFORE_SQL = (
+    f"DELETE FROM jobs WHERE status IN ({FINISHED_STATUSES_SQL}) AND completed_at < ?"
+)
+COUNT_BY_STATUS_SQL = "SELECT status, COUNT(*) as count FROM jobs GROUP BY status"
+COUNT_BY_STATUS_CONTAINER_SQL = (
+    "SELECT COUNT(*) as count FROM jobs WHERE status = ? AND container = ?"
+)
+
+# Reader connections kept per database; reads beyond this wait for a free one
+READER_POOL_SIZE = 4
+
+# Prepared statements kept per connection (sqlite3 defaults to 128). The
+# statements above are fixed strings, so each is parsed once per connection.
+STATEMENT_CACHE_SIZE = 256
+
+
+def _is_memory_database(database: str) -> bool:
+    """Check whether a database name or URI refers to an in-memory database."""
+    if database == ":memory:":
+        return True
+    if not database.startswith("file:"):
+        return False
+    path, _, query = database[len("file:") :].partition("?")
+    return path == ":memory:" or "mode=memory" in query.split("&")
+
+
+class ConnectionPool:
+    """One writer connection plus a bounded set of reader connections.
+
+    SQLite allows a single writer at a time, so writes are serialized on a
+    lock here instead of contending inside SQLite. Under WAL, readers do not
+    block the writer (or each other) and are handed out through a queue.
+    Reader connections are opened lazily on first use. With ``readers=0``
+    reads share the writer connection and its lock.
+
+    Reads only overlap writes when they come from different threads. The
+    queue manager calls JobDatabase synchronously on the event-loop thread,
+    so there the pool mainly saves reopening connections; the readers pay
+    off for callers on other threads, such as a TestClient portal.
+    """
+
+    def __init__(
+        self,
+        database: str,
+        readers: int = READER_POOL_SIZE,
+        pragmas: Iterable[str] = (),
+    ):
+        """Initialize pool and open the writer connection.
+
+        Args:
+            database: SQLite database path, or a "file:" URI
+            readers: Maximum number of reader connections (0 to read through
+                the writer)
+            pragmas: Extra PRAGMA statements run on every connection after
+                CONNECTION_PRAGMAS
+        """
+        self._database = database
+        self._pragmas = CONNECTION_PRAGMAS + tuple(pragmas)
+        self._closed = False
+        self._writer = self._connect()
+        self._writer_lock = threading.Lock()
+        self._readers: queue.LifoQueue = queue.LifoQueue(maxsize=readers)
+        for _ in range(readers):
+            self._readers.put(None)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection in autocommit mode with the connection pragmas."""
+        conn = sqlite3.connect(
+            self._database,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=STATEMENT_CACHE_SIZE,
+            uri=self._database.startswith("file:"),
+        )
+        conn.row_factory = sqlite3.Row
+        for pragma in self._pragmas:
+            conn.execute(pragma)
+        return conn
+
+    @contextmanager
+    def writer(self) -> Generator[sqlite3.Connection, None, None]:
+        """Get exclusive use of the writer connection."""
+        with self._writer_lock:
+            yield self._writer
+
+    @contextmanager
+    def reader(self) -> Generator[sqlite3.Connection, None, None]:
+        """Borrow a reader connection, blocking until one is free.
+
+        Raises:
+            sqlite3.ProgrammingError: If the pool has been closed
+        """
+        if self._readers.maxsize == 0:
+            with self.writer() as conn:
+                yield conn
+            return
+
+        conn = self._readers.get()
+        if self._closed:
+            self._release(conn)
+            raise sqlite3.ProgrammingError("Cannot operate on a closed database.")
+        try:
+            if conn is None:
+                conn = self._connect()
+            yield conn
+        finally:
+            self._release(conn)
+
+    def _release(self, conn: Optional[sqlite3.Connection]):
+        """Return a reader slot to the queue, closing it if the pool is closed."""
+        if self._closed and conn is not None:
+            conn.close()
+            conn = None
+        self._readers.put(conn)
+
+    def close(self):
+        """Close the writer and all idle reader connections.
+
+        The writer runs ``PRAGMA optimize`` first, so SQLite refreshes any
+        planner statistics that the queries of this session showed to be
+        stale. Safe to call more than once.
+        """
+        with self._writer_lock:
+            if self._closed:
+                return
+            self._closed = True
+            try:
+                self._writer.execute("PRAGMA optimize")
+            except sqlite3.Error as e:
+                logger.warning("PRAGMA optimize failed", error=str(e))
+            self._writer.close()
+        idle = 0
+        while True:
+            try:
+                conn = self._readers.get_nowait()
+            except queue.Empty:
+                break
+            idle += 1
+            if conn is not None:
+                conn.close()
+        # Put the slots back empty so waiting and later readers wake up and
+        # fail instead of blocking on a drained queue.
+        for _ in range(idle):
+            self._readers.put(None)
+
 
 class JobDatabase:
     """SQLite database for job persistence."""
 
-    def __init__(self, db_path: Path):
+    def __init__(self, db_path: Union[Path, str], pragmas: Iterable[str] = ()):
         """Initialize database.
 
         Args:
-            db_path: Path to SQLite database file
+            db_path: Path to SQLite database file, ":memory:" for a private
+                in-memory database, or a "file:" URI such as
+                "file:jobs?mode=memory&cache=shared"
+            pragmas: Extra PRAGMA statements for every connection, e.g.
+                "PRAGMA synchronous=OFF" where durability does not matter
         """
         self.db_path = db_path
+        database = str(db_path)
+        if _is_memory_database(database):
+            # An in-memory database lives on a single connection (shared
+            # cache would use table locks that fail instead of waiting), so
+            # reads go through the writer.
+            self._pool = ConnectionPool(database, readers=0, pragmas=pragmas)
+        else:
+            self._pool = ConnectionPool(database, pragmas=pragmas)
         self._init_db()
 
+    @classmethod
+    def deserialize(cls, data: bytes) -> "JobDatabase":
+        """Create a private in-memory database from serialize() output.
+
+        The schema comes with the data, so no DDL runs. Tests use this to
+        clone one initialized template instead of building a file per test.
+
+        Args:
+            data: Database image returned by serialize()
+
+        Returns:
+            In-memory JobDatabase holding a copy of the image
+        """
+        db = cls.__new__(cls)
+        db.db_path = ":memory:"
+        db._pool = ConnectionPool(":memory:", readers=0)
+        with db._pool.writer() as conn:
+            conn.deserialize(data)
+        return db
+
+    def serialize(self) -> bytes:
+        """Return the whole database (schema and rows) as bytes.
+
+        Returns:
+            Database image accepted by deserialize()
+        """
+        with self._pool.writer() as conn:
+            return conn.serialize()
+
+    def close(self):
+        """Close all pooled connections. Safe to call more than once."""
+        self._pool.close()
+
     def _init_db(self):
         """Initialize database schema."""
-        with self._get_connection() as conn:
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS jobs (
-                    job_id TEXT PRIMARY KEY,
-                    file_path TEXT NOT NULL,
-                    container TEXT NOT NULL,
-                    status TEXT NOT NULL,
-                    priority TEXT NOT NULL,
-                    source TEXT NOT NULL,
-                    webhook_id TEXT,
-                    batch_id TEXT,
-                    selected_track_index INTEGER,
-                    selected_track_language TEXT,
-                    created_at TEXT NOT NULL,
-                    started_at TEXT,
-                    completed_at TEXT,
-                    success INTEGER,
-                    error_message TEXT,
-                    retry_count INTEGER DEFAULT 0,
-                    tmdb_id INTEGER,
-                    original_language TEXT,
-                    series_title TEXT,
-                    movie_title TEXT
+        with self._pool.writer() as conn:
+            # WAL is stored in the database file, so only switch when needed
+            mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+            if mode.lower() != "wal":
+                conn.execute("PRAGMA journal_mode=WAL")
+
+        with self._transaction() as conn:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            legacy = version < SCHEMA_VERSION and conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'jobs'"
+            ).fetchone()
+
+            if legacy:
+                # Rebuild the table in the current layout. Dropping the old
+                # table also drops its (outdated) indexes before they are
+                # recreated below.
+                conn.execute("ALTER TABLE jobs RENAME TO jobs_old")
+                conn.execute(CREATE_JOBS_TABLE_SQL)
+                conn.execute(_migrate_sql(version))
+                conn.execute("DROP TABLE jobs_old")
+                logger.info(
+                    "Job database migrated", from_version=version, to_version=SCHEMA_VERSION
                 )
-            """
-            )
+            else:
+                conn.execute(CREATE_JOBS_TABLE_SQL)
+
+            # idx_status is a prefix of the two (status, ...) indexes below,
+            # so it only cost writes. Existing databases drop it here.
+            conn.execute("DROP INDEX IF EXISTS idx_status")
 
             # Create indexes for common queries
+            # Dequeue order of get_next_job, so it is an index search with no
+            # sort step
             conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_status ON jobs(status)"
+                "CREATE INDEX IF NOT EXISTS idx_jobs_status_priority_created "
+                "ON jobs(status, priority DESC, created_at)"
             )
+            # Partial indexes: most jobs have no webhook or batch ID, so NULLs
+            # are left out.
             conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_priority ON jobs(priority, created_at)"
+                "CREATE INDEX IF NOT EXISTS idx_jobs_webhook_id "
+                "ON jobs(webhook_id, created_at) WHERE webhook_id IS NOT NULL"
             )
             conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_webhook_id ON jobs(webhook_id)"
+                "CREATE INDEX IF NOT EXISTS idx_jobs_batch_id "
+                "ON jobs(batch_id, created_at) WHERE batch_id IS NOT NULL"
             )
             conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_batch_id ON jobs(batch_id)"
+                "CREATE INDEX IF NOT EXISTS idx_jobs_status_container "
+                "ON jobs(status, container)"
             )
             conn.execute(
                 "CREATE INDEX IF NOT EXISTS idx_created_at ON jobs(created_at)"
             )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_jobs_completed_at ON jobs(completed_at) "
+                f"WHERE status IN ({FINISHED_STATUSES_SQL})"
+            )
 
-            conn.commit()
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
 
         logger.info("Job database initialized", db_path=str(self.db_path))
 
     @contextmanager
     def _get_connection(self) -> Generator[sqlite3.Connection, None, None]:
-        """Get database connection context manager."""
-        conn = sqlite3.connect(self.db_path, check_same_thread=False)
-        conn.row_factory = sqlite3.Row
-        try:
+        """Borrow a pooled reader connection.
+
+        Connections run in autocommit mode; writes go through _transaction().
+        """
+        with self._pool.reader() as conn:
             yield conn
-        finally:
-            conn.close()
+
+    @contextmanager
+    def _transaction(self) -> Generator[sqlite3.Connection, None, None]:
+        """Get a connection inside a write transaction.
+
+        BEGIN IMMEDIATE takes the write lock up front, so concurrent writers
+        wait on busy_timeout instead of failing with SQLITE_BUSY on commit.
+        """
+        with self._pool.writer() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def _fetch_jobs(self, sql: str, params: tuple = ()) -> List[Job]:
+        """Run a job SELECT and build Jobs from plain tuple rows.
+
+        Raises:
+            sqlite3.Error: If the query fails
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = None  # tuples; skip sqlite3.Row for bulk reads
+            return [Job.from_db_row(row) for row in cursor.execute(sql, params)]
 
     def add_job(self, job: Job) -> bool:
         """Add job to database.
@@ -95,14 +498,8 @@ class JobDatabase:
             True if successful
         """
         try:
-            with self._get_connection() as conn:
-                data = job.to_db_dict()
-                columns = ", ".join(data.keys())
-                placeholders = ", ".join(["?" for _ in data])
-                sql = f"INSERT INTO jobs ({columns}) VALUES ({placeholders})"
-
-                conn.execute(sql, list(data.values()))
-                conn.commit()
+            with self._transaction() as conn:
+                conn.execute(INSERT_JOB_SQL, job.to_db_dict())
 
             logger.debug("Job added to database", job_id=job.job_id)
             return True
@@ -111,6 +508,30 @@ class JobDatabase:
             logger.error("Failed to add job", job_id=job.job_id, error=str(e))
             return False
 
+    def add_jobs(self, jobs: Iterable[Job]) -> bool:
+        """Add several jobs to database in a single transaction.
+
+        Args:
+            jobs: Jobs to add
+
+        Returns:
+            True if all jobs were added; on failure none are
+        """
+        rows = [job.to_db_dict() for job in jobs]
+        if not rows:
+            return True
+
+        try:
+            with self._transaction() as conn:
+                conn.executemany(INSERT_JOB_SQL, rows)
+
+            logger.debug("Jobs added to database", count=len(rows))
+            return True
+
+        except Exception as e:
+            logger.error("Failed to add jobs", count=len(rows), error=str(e))
+            return False
+
     def get_job(self, job_id: str) -> Optional[Job]:
         """Get job by ID.
 
@@ -121,13 +542,8 @@ class JobDatabase:
             Job if found, None otherwise
         """
         try:
-            with self._get_connection() as conn:
-                cursor = conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,))
-                row = cursor.fetchone()
-
-                if row:
-                    return Job.from_db_dict(dict(row))
-                return None
+            jobs = self._fetch_jobs(SELECT_JOB_SQL, (job_id,))
+            return jobs[0] if jobs else None
 
         except Exception as e:
             logger.error("Failed to get job", job_id=job_id, error=str(e))
@@ -143,16 +559,8 @@ class JobDatabase:
             True if successful
         """
         try:
-            with self._get_connection() as conn:
-                data = job.to_db_dict()
-                # Remove job_id from update data
-                job_id = data.pop("job_id")
-
-                set_clause = ", ".join([f"{k} = ?" for k in data.keys()])
-                sql = f"UPDATE jobs SET {set_clause} WHERE job_id = ?"
-
-                conn.execute(sql, list(data.values()) + [job_id])
-                conn.commit()
+            with self._transaction() as conn:
+                conn.execute(UPDATE_JOB_SQL, job.to_db_dict())
 
             logger.debug("Job updated in database", job_id=job.job_id)
             return True
@@ -161,6 +569,64 @@ class JobDatabase:
             logger.error("Failed to update job", job_id=job.job_id, error=str(e))
             return False
 
+    def update_job_statuses(
+        self,
+        updates: Iterable[tuple[str, JobStatus, Optional[bool]]],
+        now: Optional[datetime] = None,
+    ) -> bool:
+        """Update the status of several jobs in a single transaction.
+
+        Running jobs get started_at and finished jobs get completed_at set to
+        ``now``, as in JobQueueManager.update_job_status.
+
+        Args:
+            updates: (job_id, status, success) tuples; a None success leaves
+                the stored flag unchanged
+            now: Timestamp to record (defaults to the current UTC time)
+
+        Returns:
+            True if every job was updated. False if any job ID was not found
+            (the others are still updated), or if a job ID appears twice or
+            the update fails, in which case no job is updated
+        """
+        timestamp = to_epoch_us(now or datetime.utcnow())
+        rows = {}
+
+        try:
+            for job_id, status, success in updates:
+                if job_id in rows:
+                    logger.error("Duplicate job in status update", job_id=job_id)
+                    return False
+                code = STATUS_CODES[JobStatus(status).value]
+                rows[job_id] = {
+                    "job_id": job_id,
+                    "status": code,
+                    "started_at": timestamp if code == RUNNING_CODE else None,
+                    "completed_at": timestamp if code in FINISHED_CODES else None,
+                    "success": success,
+                }
+            if not rows:
+                return True
+
+            # One execute per row (the statement is cached) so each miss is known
+            with self._transaction() as conn:
+                missing = [
+                    job_id
+                    for job_id, row in rows.items()
+                    if conn.execute(UPDATE_JOB_STATUS_SQL, row).rowcount == 0
+                ]
+
+            if missing:
+                logger.error("Jobs not found for status update", job_ids=missing)
+                return False
+
+            logger.debug("Job statuses updated in database", count=len(rows))
+            return True
+
+        except Exception as e:
+            logger.error("Failed to update job statuses", count=len(rows), error=str(e))
+            return False
+
     def get_next_job(self) -> Optional[Job]:
         """Get next job from queue (highest priority, oldest first).
 
@@ -168,28 +634,9 @@ class JobDatabase:
             Next job to process, or None if queue is empty
         """
         try:
-            with self._get_connection() as conn:
-                # Order by priority (high > normal > low) then by created_at
-                cursor = conn.execute(
-                    """
-                    SELECT * FROM jobs
-                    WHERE status = ?
-                    ORDER BY
-                        CASE priority
-                            WHEN 'high' THEN 1
-                            WHEN 'normal' THEN 2
-                            WHEN 'low' THEN 3
-                        END,
-                        created_at ASC
-                    LIMIT 1
-                """,
-                    (JobStatus.QUEUED.value,),
-                )
-                row = cursor.fetchone()
-
-                if row:
-                    return Job.from_db_dict(dict(row))
-                return None
+            # Order by priority (high > normal > low) then by created_at
+            jobs = self._fetch_jobs(SELECT_NEXT_JOB_SQL, (QUEUED_CODE,))
+            return jobs[0] if jobs else None
 
         except Exception as e:
             logger.error("Failed to get next job", error=str(e))
@@ -205,14 +652,7 @@ class JobDatabase:
             List of jobs
         """
         try:
-            with self._get_connection() as conn:
-                cursor = conn.execute(
-                    "SELECT * FROM jobs WHERE status = ? ORDER BY created_at DESC",
-                    (status.value,),
-                )
-                rows = cursor.fetchall()
-
-                return [Job.from_db_dict(dict(row)) for row in rows]
+            return self._fetch_jobs(SELECT_JOBS_BY_STATUS_SQL, (STATUS_CODES[status.value],))
 
         except Exception as e:
             logger.error("Failed to get jobs by status", status=status, error=str(e))
@@ -228,14 +668,7 @@ class JobDatabase:
             List of jobs
         """
         try:
-            with self._get_connection() as conn:
-                cursor = conn.execute(
-                    "SELECT * FROM jobs WHERE webhook_id = ? ORDER BY created_at ASC",
-                    (webhook_id,),
-                )
-                rows = cursor.fetchall()
-
-                return [Job.from_db_dict(dict(row)) for row in rows]
+            return self._fetch_jobs(SELECT_JOBS_BY_WEBHOOK_SQL, (webhook_id,))
 
         except Exception as e:
             logger.error(
@@ -253,14 +686,7 @@ class JobDatabase:
             List of jobs
         """
         try:
-            with self._get_connection() as conn:
-                cursor = conn.execute(
-                    "SELECT * FROM jobs WHERE batch_id = ? ORDER BY created_at ASC",
-                    (batch_id,),
-                )
-                rows = cursor.fetchall()
-
-                return [Job.from_db_dict(dict(row)) for row in rows]
+            return self._fetch_jobs(SELECT_JOBS_BY_BATCH_SQL, (batch_id,))
 
         except Exception as e:
             logger.error(
@@ -274,44 +700,20 @@ class JobDatabase:
         Returns:
             Dictionary with status counts
         """
+        stats = {status.value: 0 for status in JobStatus}
+
         try:
             with self._get_connection() as conn:
-                cursor = conn.execute(
-                    """
-                    SELECT status, COUNT(*) as count
-                    FROM jobs
-                    GROUP BY status
-                """
-                )
-                rows = cursor.fetchall()
-
-                stats = {
-                    "total": 0,
-                    "queued": 0,
-                    "running": 0,
-                    "completed": 0,
-                    "failed": 0,
-                    "cancelled": 0,
-                }
-
-                for row in rows:
-                    status = row["status"]
-                    count = row["count"]
-                    stats[status] = count
-                    stats["total"] += count
-
-                return stats
+                cursor = conn.execute(COUNT_BY_STATUS_SQL)
+                for row in cursor:
+                    stats[STATUS_VALUES[row["status"]]] = row["count"]
 
         except Exception as e:
             logger.error("Failed to get queue stats", error=str(e))
-            return {
-                "total": 0,
-                "queued": 0,
-                "running": 0,
-                "completed": 0,
-                "failed": 0,
-                "cancelled": 0,
-            }
+            stats = dict.fromkeys(stats, 0)
+
+        stats["total"] = sum(stats.values())
+        return stats
 
     def count_running_by_container(self, container: str) -> int:
         """Count running jobs for specific container type.
@@ -325,12 +727,7 @@ class JobDatabase:
         try:
             with self._get_connection() as conn:
                 cursor = conn.execute(
-                    """
-                    SELECT COUNT(*) as count
-                    FROM jobs
-                    WHERE status = ? AND container = ?
-                """,
-                    (JobStatus.RUNNING.value, container),
+                    COUNT_BY_STATUS_CONTAINER_SQL, (RUNNING_CODE, container)
                 )
                 row = cursor.fetchone()
                 return row["count"] if row else 0
@@ -351,31 +748,16 @@ class JobDatabase:
             Number of jobs deleted
         """
         try:
-            cutoff = datetime.utcnow().replace(
-                hour=0, minute=0, second=0, microsecond=0
-            )
-            cutoff_str = cutoff.isoformat()
+            cutoff = to_epoch_us(datetime.utcnow() - timedelta(days=days))
 
-            with self._get_connection() as conn:
-                cursor = conn.execute(
-                    """
-                    DELETE FROM jobs
-                    WHERE status IN (?, ?, ?)
-                    AND completed_at < datetime(?, '-' || ? || ' days')
-                """,
-                    (
-                        JobStatus.COMPLETED.value,
-                        JobStatus.FAILED.value,
-                        JobStatus.CANCELLED.value,
-                        cutoff_str,
-                        days,
-                    ),
-                )
+            with self._transaction() as conn:
+                cursor = conn.execute(DELETE_FINISHED_BEFORE_SQL, (cutoff,))
                 deleted = cursor.rowcount
-                conn.commit()
 
             if deleted > 0:
                 logger.info("Cleaned up old jobs", deleted=deleted, days=days)
+                # The table shape changed; refresh planner statistics
+                self.analyze()
 
             return deleted
 
@@ -383,6 +765,24 @@ class JobDatabase:
             logger.error("Failed to cleanup old jobs", error=str(e))
             return 0
 
+    def analyze(self) -> bool:
+        """Gather planner statistics for the jobs table and its indexes.
+
+        Without statistics SQLite may prefer a table scan over the status,
+        webhook and batch indexes.
+
+        Returns:
+            True if successful
+        """
+        try:
+            with self._pool.writer() as conn:
+                conn.execute("ANALYZE jobs")
+            return True
+
+        except Exception as e:
+            logger.error("Failed to analyze database", error=str(e))
+            return False
+
     def delete_job(self, job_id: str) -> bool:
         """Delete job from database.
 
@@ -393,9 +793,8 @@ class JobDatabase:
             True if successful
         """
         try:
-            with self._get_connection() as conn:
-                conn.execute("DELETE FROM jobs WHERE job_id = ?", (job_id,))
-                conn.commit()
+            with self._transaction() as conn:
+                conn.execute(DELETE_JOB_SQL, (job_id,))
 
             logger.debug("Job deleted from database", job_id=job_id)
             return True
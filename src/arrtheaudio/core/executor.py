@@ -1,14 +1,105 @@
 """Executors for modifying audio track metadata."""
 
+import functools
+import os
+import shutil
 import subprocess
 from abc import ABC, abstractmethod
 from pathlib import Path
+from typing import Callable, Optional
 
 from arrtheaudio.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 
+@functools.cache
+def _find_ffmpeg() -> Optional[str]:
+    """Locate ffmpeg on PATH once per process instead of once per executor."""
+    return shutil.which("ffmpeg")
+
+
+@functools.cache
+def _find_ffprobe() -> str:
+    """Resolve ffprobe to an absolute path once (bare name if not on PATH)."""
+    return shutil.which("ffprobe") or "ffprobe"
+
+
+def _backup_atomic(src: Path, dst: Path) -> None:
+    """Preserve the current contents of src at dst without a user-space copy.
+
+    A hard link costs no data copy and stays valid as a backup because the
+    original is only ever swapped out by rename, never rewritten in place.
+    When linking is refused (e.g. dst on another filesystem) the bytes are
+    copied in-kernel with copy_file_range, falling back to shutil.copy2
+    where that is unavailable.
+
+    Args:
+        src: File to back up
+        dst: Backup path (replaced if it already exists)
+    """
+    dst.unlink(missing_ok=True)
+
+    try:
+        os.link(src, dst)
+        return
+    except OSError:
+        pass
+
+    try:
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            remaining = os.fstat(fsrc.fileno()).st_size
+            while remaining > 0:
+                copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+        shutil.copystat(src, dst)
+    except (AttributeError, OSError):
+        # No copy_file_range here (non-Linux or old kernel)
+        shutil.copy2(src, dst)
+
+
+def _probe_audio_track_count(file_path: Path) -> int:
+    """Count audio streams with ffprobe.
+
+    ffprobe filters to audio streams itself and prints one index per line,
+    so there is no JSON to build or parse.
+
+    Args:
+        file_path: Path to the media file
+
+    Returns:
+        Number of audio tracks
+
+    Raises:
+        subprocess.CalledProcessError: If ffprobe fails
+        subprocess.TimeoutExpired: If ffprobe takes longer than 30 seconds
+    """
+    cmd = [
+        _find_ffprobe(),
+        "-v",
+        "error",
+        "-select_streams",
+        "a",
+        "-show_entries",
+        "stream=index",
+        "-of",
+        "csv=p=0",
+        str(file_path),
+    ]
+
+    # CPython launches with posix_spawn (vfork-style, no page-table copy of a
+    # large worker heap) instead of fork+exec only when the executable is an
+    # absolute path, close_fds is False and there is no preexec_fn, pass_fds,
+    # cwd or new session. Not closing fds is safe: Python creates its own fds
+    # non-inheritable (PEP 446), so only the stdio pipes reach the child.
+    result = subprocess.run(
+        cmd, capture_output=True, text=True, check=True, timeout=30, close_fds=False
+    )
+    return len(result.stdout.splitlines())
+
+
 class AudioTrackExecutor(ABC):
     """Abstract base class for audio track executors."""
 
@@ -39,26 +130,7 @@ class MKVExecutor(AudioTrackExecutor):
             Number of audio tracks
         """
         try:
-            import json
-
-            cmd = [
-                "ffprobe",
-                "-v",
-                "quiet",
-                "-print_format",
-                "json",
-                "-show_streams",
-                "-select_streams",
-                "a",
-                str(file_path),
-            ]
-
-            result = subprocess.run(
-                cmd, capture_output=True, text=True, check=True, timeout=30
-            )
-
-            data = json.loads(result.stdout)
-            return len(data.get("streams", []))
+            return _probe_audio_track_count(file_path)
         except Exception as e:
             logger.warning(
                 "Failed to get track count, using default of 10",
@@ -180,8 +252,7 @@ class MP4Executor(AudioTrackExecutor):
         self.timeout_seconds = timeout_seconds
 
         # Check if ffmpeg is available
-        import shutil
-        self.ffmpeg_path = shutil.which("ffmpeg")
+        self.ffmpeg_path = _find_ffmpeg()
         if not self.ffmpeg_path:
             raise RuntimeError("ffmpeg not found in PATH - required for MP4 support")
 
@@ -195,26 +266,7 @@ class MP4Executor(AudioTrackExecutor):
             Number of audio tracks
         """
         try:
-            import json
-
-            cmd = [
-                "ffprobe",
-                "-v",
-                "quiet",
-                "-print_format",
-                "json",
-                "-show_streams",
-                "-select_streams",
-                "a",
-                str(file_path),
-            ]
-
-            result = subprocess.run(
-                cmd, capture_output=True, text=True, check=True, timeout=30
-            )
-
-            data = json.loads(result.stdout)
-            return len(data.get("streams", []))
+            return _probe_audio_track_count(file_path)
         except Exception as e:
             logger.warning(
                 "Failed to get audio track count",
@@ -234,7 +286,6 @@ class MP4Executor(AudioTrackExecutor):
         Returns:
             True if sufficient space, False otherwise
         """
-        import shutil
 
         file_size = file_path.stat().st_size
         required_space = file_size * 2
@@ -260,7 +311,7 @@ class MP4Executor(AudioTrackExecutor):
         return True
 
     def _build_ffmpeg_command(
-        self, input_file: Path, output_file: Path, default_track_index: int, track_count: int
+        self, input_file: Path, output_file: Path, default_track_index: int
     ) -> list[str]:
         """Build ffmpeg command for remuxing with audio disposition.
 
@@ -268,7 +319,6 @@ class MP4Executor(AudioTrackExecutor):
             input_file: Source MP4 file
             output_file: Destination file
             default_track_index: Audio track to mark as default (0-based)
-            track_count: Total number of audio tracks
 
         Returns:
             Command list for subprocess
@@ -280,17 +330,20 @@ class MP4Executor(AudioTrackExecutor):
             "-c", "copy",  # Copy codecs (no re-encode)
         ]
 
-        # Set disposition for each audio track
-        for i in range(track_count):
-            disposition = "default" if i == default_track_index else "0"
-            cmd.extend([f"-disposition:a:{i}", disposition])
+        # Clear every audio disposition, then mark the chosen track. ffmpeg
+        # applies the last matching per-stream option, so the track-specific
+        # flag wins for the selected track regardless of track count.
+        cmd += [
+            "-disposition:a", "0",
+            f"-disposition:a:{default_track_index}", "default",
+        ]
 
         # Output options
-        cmd.extend([
+        cmd += [
             "-movflags", "+faststart",  # Optimize for streaming
             "-y",  # Overwrite output
-            str(output_file)
-        ])
+            str(output_file),
+        ]
 
         return cmd
 
@@ -356,16 +409,17 @@ class MP4Executor(AudioTrackExecutor):
 
         try:
             # Build ffmpeg command
-            cmd = self._build_ffmpeg_command(file_path, temp_file, track_index, track_count)
+            cmd = self._build_ffmpeg_command(file_path, temp_file, track_index)
 
             logger.debug("Executing ffmpeg remux", file=str(file_path), command=cmd)
 
-            # Execute ffmpeg remux
+            # Execute ffmpeg remux (spawn-eligible; see _probe_audio_track_count)
             result = subprocess.run(
                 cmd,
                 capture_output=True,
                 text=True,
                 timeout=self.timeout_seconds,
+                close_fds=False,
             )
 
             if result.returncode != 0:
@@ -405,8 +459,7 @@ class MP4Executor(AudioTrackExecutor):
                 return False
 
             # Create backup of original
-            import shutil
-            shutil.copy2(file_path, backup_file)
+            _backup_atomic(file_path, backup_file)
             logger.debug("Created backup", backup=str(backup_file))
 
             # Atomic replace
@@ -440,9 +493,8 @@ class MP4Executor(AudioTrackExecutor):
             # Restore from backup if it exists
             if backup_file.exists():
                 logger.info("Restoring from backup", file=str(file_path))
-                import shutil
                 try:
-                    shutil.copy2(backup_file, file_path)
+                    os.replace(backup_file, file_path)
                     logger.info("Restored from backup successfully")
                 except Exception as restore_error:
                     logger.error("Failed to restore from backup", error=str(restore_error))
@@ -454,8 +506,11 @@ class MP4Executor(AudioTrackExecutor):
 def get_executor(container_type: str, timeout_seconds: int = 300) -> AudioTrackExecutor:
     """Get the appropriate executor for a container type.
 
+    Executors hold no per-file state, so one instance is shared per
+    (container type, timeout) instead of being built for every job.
+
     Args:
-        container_type: Container type ("mkv" or "mp4")
+        container_type: Container type ("mkv" or "mp4", any case)
         timeout_seconds: Timeout for operations (only applies to MP4)
 
     Returns:
@@ -464,9 +519,19 @@ def get_executor(container_type: str, timeout_seconds: int = 300) -> AudioTrackE
     Raises:
         ValueError: If container type is not supported
     """
-    if container_type.lower() == "mkv":
-        return MKVExecutor()
-    elif container_type.lower() == "mp4":
-        return MP4Executor(timeout_seconds=timeout_seconds)
-    else:
+    return _cached_executor(container_type.lower(), timeout_seconds)
+
+
+_EXECUTORS: dict[str, Callable[[int], AudioTrackExecutor]] = {
+    "mkv": lambda timeout_seconds: MKVExecutor(),
+    "mp4": lambda timeout_seconds: MP4Executor(timeout_seconds=timeout_seconds),
+}
+
+
+@functools.lru_cache(maxsize=8)
+def _cached_executor(container_type: str, timeout_seconds: int) -> AudioTrackExecutor:
+    """Build (once per key) the executor for a lower-cased container type."""
+    factory = _EXECUTORS.get(container_type)
+    if factory is None:
         raise ValueError(f"Unsupported container type: {container_type}")
+    return factory(timeout_seconds)
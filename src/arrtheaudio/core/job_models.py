@@ -1,6 +1,7 @@
 """Job models for queue system."""
 
-from datetime import datetime
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
 from enum import Enum
 from pathlib import Path
 from typing import Optional
@@ -8,6 +9,37 @@ from uuid import uuid4
 
 from pydantic import BaseModel, Field, ConfigDict
 
+# Timestamps are naive UTC datetimes in memory and integer microseconds since
+# the Unix epoch in the database.
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def to_epoch_us(value: datetime) -> int:
+    """Convert a datetime to integer microseconds since the Unix epoch.
+
+    Args:
+        value: Naive UTC datetime (aware datetimes are converted to UTC)
+
+    Returns:
+        Microseconds since 1970-01-01T00:00:00 UTC
+    """
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def from_epoch_us(value: int) -> datetime:
+    """Convert integer microseconds since the Unix epoch to a naive UTC datetime.
+
+    Args:
+        value: Microseconds since 1970-01-01T00:00:00 UTC
+
+    Returns:
+        Naive UTC datetime
+    """
+    return _EPOCH + timedelta(microseconds=value)
+
 
 class JobStatus(str, Enum):
     """Job status enum."""
@@ -36,6 +68,39 @@ class JobSource(str, Enum):
     RETRY = "retry"
 
 
+# Integer codes for the enum columns of the jobs table. Codes are part of the
+# stored format: never renumber them, only append. Priority codes rank HIGH
+# highest so "ORDER BY priority DESC" dequeues high-priority jobs first.
+STATUS_CODES = {
+    JobStatus.QUEUED.value: 0,
+    JobStatus.RUNNING.value: 1,
+    JobStatus.COMPLETED.value: 2,
+    JobStatus.FAILED.value: 3,
+    JobStatus.CANCELLED.value: 4,
+}
+PRIORITY_CODES = {
+    JobPriority.HIGH.value: 3,
+    JobPriority.NORMAL.value: 2,
+    JobPriority.LOW.value: 1,
+}
+SOURCE_CODES = {
+    JobSource.SONARR.value: 0,
+    JobSource.RADARR.value: 1,
+    JobSource.MANUAL.value: 2,
+    JobSource.RETRY.value: 3,
+}
+
+# Reverse lookups used when loading rows
+STATUS_VALUES = {code: value for value, code in STATUS_CODES.items()}
+PRIORITY_VALUES = {code: value for value, code in PRIORITY_CODES.items()}
+SOURCE_VALUES = {code: value for value, code in SOURCE_CODES.items()}
+
+
+def _enum_value(value) -> str:
+    """Return the string value of an enum member (or an already-plain value)."""
+    return value.value if isinstance(value, Enum) else value
+
+
 class Job(BaseModel):
     """Job model for processing a single file."""
 
@@ -86,18 +151,16 @@ class Job(BaseModel):
             "job_id": self.job_id,
             "file_path": self.file_path,
             "container": self.container,
-            "status": self.status.value if isinstance(self.status, Enum) else self.status,
-            "priority": (
-                self.priority.value if isinstance(self.priority, Enum) else self.priority
-            ),
-            "source": self.source.value if isinstance(self.source, Enum) else self.source,
+            "status": STATUS_CODES[_enum_value(self.status)],
+            "priority": PRIORITY_CODES[_enum_value(self.priority)],
+            "source": SOURCE_CODES[_enum_value(self.source)],
             "webhook_id": self.webhook_id,
             "batch_id": self.batch_id,
             "selected_track_index": self.selected_track_index,
             "selected_track_language": self.selected_track_language,
-            "created_at": self.created_at.isoformat(),
-            "started_at": self.started_at.isoformat() if self.started_at else None,
-            "completed_at": self.completed_at.isoformat() if self.completed_at else None,
+            "created_at": to_epoch_us(self.created_at),
+            "started_at": to_epoch_us(self.started_at) if self.started_at else None,
+            "completed_at": to_epoch_us(self.completed_at) if self.completed_at else None,
             "success": self.success,
             "error_message": self.error_message,
             "retry_count": self.retry_count,
@@ -110,27 +173,87 @@ class Job(BaseModel):
     @classmethod
     def from_db_dict(cls, data: dict) -> "Job":
         """Create Job from database dictionary."""
-        # Convert ISO format strings back to datetime
-        if data.get("created_at"):
-            data["created_at"] = datetime.fromisoformat(data["created_at"])
-        if data.get("started_at"):
-            data["started_at"] = datetime.fromisoformat(data["started_at"])
-        if data.get("completed_at"):
-            data["completed_at"] = datetime.fromisoformat(data["completed_at"])
-
-        return cls(**data)
+        # Decode integer enum columns
+        data["status"] = STATUS_VALUES[data["status"]]
+        data["priority"] = PRIORITY_VALUES[data["priority"]]
+        data["source"] = SOURCE_VALUES[data["source"]]
 
+        # Convert epoch microseconds back to datetime
+        for column in ("created_at", "started_at", "completed_at"):
+            if data.get(column) is not None:
+                data[column] = from_epoch_us(data[column])
 
-class BatchRequest(BaseModel):
-    """Request model for batch processing."""
+        return cls(**data)
 
-    path: str = Field(..., description="Directory path to scan")
-    recursive: bool = Field(default=True, description="Scan subdirectories")
-    pattern: str = Field(default="**/*.{mkv,mp4}", description="File pattern")
-    dry_run: bool = Field(default=False, description="Preview without processing")
-    priority: JobPriority = Field(
-        default=JobPriority.NORMAL, description="Job priority"
-    )
+    @classmethod
+    def from_db_row(cls, row: tuple) -> "Job":
+        """Create Job from a database row in to_db_dict() column order.
+
+        Rows were validated when the job was stored, so this skips validation
+        (model_construct) and only converts what SQLite cannot hold natively:
+        integer enum codes, epoch-microsecond timestamps and the 0/1 success
+        flag.
+        """
+        (
+            job_id,
+            file_path,
+            container,
+            status,
+            priority,
+            source,
+            webhook_id,
+            batch_id,
+            selected_track_index,
+            selected_track_language,
+            created_at,
+            started_at,
+            completed_at,
+            success,
+            error_message,
+            retry_count,
+            tmdb_id,
+            original_language,
+            series_title,
+            movie_title,
+        ) = row
+
+        return cls.model_construct(
+            job_id=job_id,
+            file_path=file_path,
+            container=container,
+            status=STATUS_VALUES[status],
+            priority=PRIORITY_VALUES[priority],
+            source=SOURCE_VALUES[source],
+            webhook_id=webhook_id,
+            batch_id=batch_id,
+            selected_track_index=selected_track_index,
+            selected_track_language=selected_track_language,
+            created_at=from_epoch_us(created_at),
+            started_at=None if started_at is None else from_epoch_us(started_at),
+            completed_at=None if completed_at is None else from_epoch_us(completed_at),
+            success=None if success is None else bool(success),
+            error_message=error_message,
+            retry_count=retry_count,
+            tmdb_id=tmdb_id,
+            original_language=original_language,
+            series_title=series_title,
+            movie_title=movie_title,
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class BatchRequest:
+    """Request for batch processing.
+
+    Built by callers from already validated input (the API validates its own
+    BatchRequest model), so this is a plain immutable record.
+    """
+
+    path: str  # Directory path to scan
+    recursive: bool = True  # Scan subdirectories
+    pattern: str = "**/*.{mkv,mp4}"  # File pattern
+    dry_run: bool = False  # Preview without processing
+    priority: JobPriority = JobPriority.NORMAL
 
 
 class BatchResponse(BaseModel):
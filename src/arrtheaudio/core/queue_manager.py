@@ -1,9 +1,12 @@
 """Job queue manager."""
 
 import asyncio
+import fnmatch
+import os
+import re
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
+from typing import Callable, Iterable, List, Optional, Union
 from uuid import uuid4
 
 from arrtheaudio.config import Config
@@ -20,19 +23,79 @@ from arrtheaudio.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+_BRACE_RE = re.compile(r"\{([^{}]*)\}")
+
+
+def _expand_braces(pattern: str) -> List[str]:
+    """Expand shell-style braces, e.g. "*.{mkv,mp4}" -> ["*.mkv", "*.mp4"].
+
+    Args:
+        pattern: Glob pattern, optionally containing {a,b} groups
+
+    Returns:
+        List of patterns without braces
+    """
+    match = _BRACE_RE.search(pattern)
+    if not match:
+        return [pattern]
+
+    head, tail = pattern[: match.start()], pattern[match.end() :]
+    return [
+        expanded
+        for alternative in match.group(1).split(",")
+        for expanded in _expand_braces(f"{head}{alternative}{tail}")
+    ]
+
+
+def _name_matcher(pattern: str) -> Callable[[str], bool]:
+    """Build a file-name predicate for a (brace-expanded) glob pattern.
+
+    Pure extension patterns such as "*.{mkv,mp4}" become a single frozenset
+    lookup; anything else falls back to fnmatch. Both follow fnmatch's case
+    rule (via os.path.normcase), which is also the one Path.glob applies.
+
+    Args:
+        pattern: File-name glob pattern (no directory parts)
+
+    Returns:
+        Function returning True for matching file names
+    """
+    patterns = _expand_braces(pattern)
+    extensions = frozenset(
+        os.path.normcase(p[1:])
+        for p in patterns
+        if p.startswith("*.") and not any(c in p[2:] for c in "*?[.")
+    )
+    if len(extensions) == len(patterns):
+        return lambda name: os.path.splitext(os.path.normcase(name))[1] in extensions
+
+    return lambda name: any(fnmatch.fnmatch(name, p) for p in patterns)
+
 
 class JobQueueManager:
     """Manages job queue and database operations."""
 
-    def __init__(self, config: Config, db_path: Path):
+    def __init__(
+        self,
+        config: Config,
+        db_path: Optional[Union[Path, str]] = None,
+        db: Optional[JobDatabase] = None,
+        pragmas: Iterable[str] = (),
+    ):
         """Initialize queue manager.
 
         Args:
             config: Application configuration
-            db_path: Path to SQLite database
+            db_path: Path to SQLite database, or a "file:" URI
+            db: Already opened database to use instead of db_path
+            pragmas: Extra PRAGMA statements for the connections opened on
+                db_path
         """
+        if db is None and db_path is None:
+            raise ValueError("Either db_path or db is required")
+
         self.config = config
-        self.db = JobDatabase(db_path)
+        self.db = db if db is not None else JobDatabase(db_path, pragmas=pragmas)
         self.detector = ContainerDetector()
         self._lock = asyncio.Lock()
 
@@ -65,26 +128,8 @@ class JobQueueManager:
             Created Job or None if failed
         """
         try:
-            # Detect container type
-            container = self.detector.detect(file_path)
-            if container.value == "unsupported":
-                logger.warning(
-                    "Unsupported container type, skipping", file=str(file_path)
-                )
-                return None
-
-            # Check if enabled in config
-            if container.value == "mkv" and not self.config.containers.mkv:
-                logger.debug("MKV processing disabled", file=str(file_path))
-                return None
-            if container.value == "mp4" and not self.config.containers.mp4:
-                logger.debug("MP4 processing disabled", file=str(file_path))
-                return None
-
-            # Create job
-            job = Job(
-                file_path=str(file_path.resolve()),
-                container=container.value,
+            job = self._build_job(
+                file_path,
                 priority=priority,
                 source=source,
                 webhook_id=webhook_id,
@@ -94,6 +139,8 @@ class JobQueueManager:
                 series_title=series_title,
                 movie_title=movie_title,
             )
+            if job is None:
+                return None
 
             # Add to database
             async with self._lock:
@@ -116,6 +163,133 @@ class JobQueueManager:
             )
             return None
 
+    async def submit_jobs(
+        self,
+        file_paths: Iterable[Path],
+        priority: JobPriority = JobPriority.NORMAL,
+        source: JobSource = JobSource.MANUAL,
+        webhook_id: Optional[str] = None,
+        batch_id: Optional[str] = None,
+        tmdb_id: Optional[int] = None,
+        original_language: Optional[str] = None,
+        series_title: Optional[str] = None,
+        movie_title: Optional[str] = None,
+    ) -> List[Job]:
+        """Submit several files sharing the same options in one transaction.
+
+        Files that cannot become a job (unsupported or disabled container,
+        detection error) are skipped; the rest are inserted together.
+
+        Args:
+            file_paths: Paths to files
+            priority: Job priority
+            source: Job source
+            webhook_id: Optional webhook ID to link jobs
+            batch_id: Optional batch ID to link jobs
+            tmdb_id: Optional TMDB ID for metadata
+            original_language: Optional original language
+            series_title: Optional series title
+            movie_title: Optional movie title
+
+        Returns:
+            Created jobs (empty if the insert failed)
+        """
+        jobs = []
+        for file_path in file_paths:
+            try:
+                job = self._build_job(
+                    file_path,
+                    priority=priority,
+                    source=source,
+                    webhook_id=webhook_id,
+                    batch_id=batch_id,
+                    tmdb_id=tmdb_id,
+                    original_language=original_language,
+                    series_title=series_title,
+                    movie_title=movie_title,
+                )
+            except Exception as e:
+                logger.error("Failed to create job", file=str(file_path), error=str(e))
+                continue
+
+            if job:
+                jobs.append(job)
+
+        if not jobs:
+            return []
+
+        async with self._lock:
+            if not self.db.add_jobs(jobs):
+                logger.error("Failed to add jobs to database", count=len(jobs))
+                return []
+
+        logger.info(
+            "Jobs submitted",
+            count=len(jobs),
+            priority=priority if isinstance(priority, str) else priority.value,
+            source=source if isinstance(source, str) else source.value,
+            webhook_id=webhook_id,
+            batch_id=batch_id,
+        )
+        return jobs
+
+    def _build_job(
+        self,
+        file_path: Path,
+        priority: JobPriority = JobPriority.NORMAL,
+        source: JobSource = JobSource.MANUAL,
+        webhook_id: Optional[str] = None,
+        batch_id: Optional[str] = None,
+        tmdb_id: Optional[int] = None,
+        original_language: Optional[str] = None,
+        series_title: Optional[str] = None,
+        movie_title: Optional[str] = None,
+    ) -> Optional[Job]:
+        """Create a job for a file without persisting it.
+
+        Args:
+            file_path: Path to file
+            priority: Job priority
+            source: Job source
+            webhook_id: Optional webhook ID to link jobs
+            batch_id: Optional batch ID to link jobs
+            tmdb_id: Optional TMDB ID for metadata
+            original_language: Optional original language
+            series_title: Optional series title
+            movie_title: Optional movie title
+
+        Returns:
+            Job, or None if the container is unsupported or disabled
+        """
+        # Detect container type
+        container = self.detector.detect(file_path)
+        if container.value == "unsupported":
+            logger.warning(
+                "Unsupported container type, skipping", file=str(file_path)
+            )
+            return None
+
+        # Check if enabled in config
+        if container.value == "mkv" and not self.config.containers.mkv:
+            logger.debug("MKV processing disabled", file=str(file_path))
+            return None
+        if container.value == "mp4" and not self.config.containers.mp4:
+            logger.debug("MP4 processing disabled", file=str(file_path))
+            return None
+
+        return Job(
+            file_path=str(file_path.resolve()),
+            container=container.value,
+            priority=priority,
+            source=source,
+            webhook_id=webhook_id,
+            batch_id=batch_id,
+            tmdb_id=tmdb_id,
+            original_language=original_language,
+            series_title=series_title,
+            movie_title=movie_title,
+        )
+
     async def submit_batch(self, request: BatchRequest) -> tuple[str, List[Job]]:
         """Submit batch of files for processing.
 
@@ -151,28 +325,24 @@ class JobQueueManager:
 
             logger.info("Found files for batch", batch_id=batch_id, count=len(files))
 
-            # Create jobs for each file
-            for file_path in files:
-                if request.dry_run:
-                    # Just log what would be processed
+            if request.dry_run:
+                # Just log what would be processed
+                for file_path in files:
                     container = self.detector.detect(file_path)
                     logger.info(
                         "Would process file (dry run)",
                         file=str(file_path),
                         container=container.value,
                     )
-                    continue
-
-                job = await self.submit_job(
-                    file_path=file_path,
+            else:
+                # Insert the whole scan in one transaction
+                jobs = await self.submit_jobs(
+                    files,
                     priority=request.priority,
                     source=JobSource.MANUAL,
                     batch_id=batch_id,
                 )
 
-                if job:
-                    jobs.append(job)
-
             logger.info(
                 "Batch submission complete",
                 batch_id=batch_id,
@@ -196,6 +366,12 @@ class JobQueueManager:
     ) -> List[Path]:
         """Find files matching pattern.
 
+        File-name patterns (including brace groups such as "**/*.{mkv,mp4}",
+        which Path.glob does not expand) are matched during a single os.scandir
+        walk, using the file type cached on each entry instead of a stat per
+        file. Patterns with directory parts fall back to Path.glob, once per
+        brace alternative.
+
         Args:
             path: Directory to scan
             pattern: Glob pattern
@@ -207,17 +383,32 @@ class JobQueueManager:
         files = []
 
         try:
-            if recursive:
-                # Use ** for recursive glob
-                if not pattern.startswith("**/"):
-                    pattern = f"**/{pattern}"
-                files = list(path.glob(pattern))
-            else:
-                # Non-recursive glob
-                files = list(path.glob(pattern))
+            name_pattern = pattern[3:] if pattern.startswith("**/") else pattern
 
-            # Filter to only files (not directories)
-            files = [f for f in files if f.is_file()]
+            if "/" in name_pattern:
+                if recursive and not pattern.startswith("**/"):
+                    pattern = f"**/{pattern}"
+                # dict.fromkeys drops files matched by overlapping alternatives
+                files = dict.fromkeys(
+                    f for p in _expand_braces(pattern) for f in path.glob(p) if f.is_file()
+                )
+                return list(files)
+
+            matches = _name_matcher(name_pattern)
+            pending = [path]
+
+            while pending:
+                directory = pending.pop()
+                try:
+                    with os.scandir(directory) as entries:
+                        for entry in entries:
+                            if recursive and entry.is_dir(follow_symlinks=False):
+                                pending.append(entry.path)
+                            elif matches(entry.name) and entry.is_file():
+                                files.append(Path(entry.path))
+                except OSError as e:
+                    # Skip unreadable or vanished directories, as Path.glob does
+                    logger.warning("Skipping directory", path=directory, error=str(e))
 
             return files
 
@@ -305,6 +496,21 @@ class JobQueueManager:
 
             return self.db.update_job(job)
 
+    async def update_job_statuses(
+        self, updates: Iterable[tuple[str, JobStatus, Optional[bool]]]
+    ) -> bool:
+        """Update the status of several jobs in one transaction.
+
+        Args:
+            updates: (job_id, status, success) tuples; success may be None
+
+        Returns:
+            True if every job was updated, False if any was not found, a job
+            ID appears twice, or the update failed
+        """
+        async with self._lock:
+            return self.db.update_job_statuses(updates)
+
     async def cancel_job(self, job_id: str) -> bool:
         """Cancel a job.
 
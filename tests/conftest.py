@@ -1,17 +1,125 @@
 """Shared pytest fixtures for ArrTheAudio tests."""
 
+import functools
+import hashlib
+import hmac
+import os
+import sys
 from pathlib import Path
 
+import orjson
 import pytest
 
 from arrtheaudio.config import Config, PathOverride
+from arrtheaudio.core.database import JobDatabase
 from arrtheaudio.models.metadata import MediaMetadata
 from arrtheaudio.models.track import AudioTrack
 
+WEBHOOK_SECRET = "test_secret_key"
 
-@pytest.fixture
+# Test files and SQLite databases only need to exist, so keep tmp_path on
+# tmpfs where available. An explicit PYTEST_DEBUG_TEMPROOT still wins.
+if sys.platform.startswith("linux") and os.access("/dev/shm", os.W_OK):
+    os.environ.setdefault("PYTEST_DEBUG_TEMPROOT", "/dev/shm")
+
+# Keyed once; copy() reuses the ipad/opad key schedule for every signature.
+_HMAC_TEMPLATE = hmac.new(WEBHOOK_SECRET.encode(), digestmod=hashlib.sha256)
+
+
+@functools.lru_cache(maxsize=None)
+def _sign(body: bytes, secret: str) -> str:
+    """Compute the HMAC-SHA256 hex signature of a request body (cached)."""
+    if secret == WEBHOOK_SECRET:
+        mac = _HMAC_TEMPLATE.copy()
+        mac.update(body)
+    else:
+        mac = hmac.new(secret.encode(), body, hashlib.sha256)
+    return mac.hexdigest()
+
+
+@pytest.fixture(scope="session")
+def signed_payload():
+    """Serialize and sign webhook payloads.
+
+    Returns a callable ``(payload, secret) -> (body, signature)``. The body is
+    serialized once and the signature is computed over those exact bytes, so
+    tests must send ``content=body`` rather than ``json=payload``.
+    """
+
+    def _signed(payload: dict, secret: str = WEBHOOK_SECRET) -> tuple[bytes, str]:
+        body = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+        return body, _sign(body, secret)
+
+    return _signed
+
+
+@pytest.fixture(scope="session")
+def signed_post(signed_payload):
+    """POST a signed webhook payload.
+
+    Returns a callable ``(client, url, payload, secret) -> response`` that
+    sends the signed bytes with the ``X-Webhook-Signature`` header. With an
+    ``httpx.AsyncClient`` the returned value must be awaited.
+    """
+
+    def _post(client, url: str, payload: dict, secret: str = WEBHOOK_SECRET):
+        body, signature = signed_payload(payload, secret)
+        return client.post(
+            url,
+            content=body,
+            headers={"X-Webhook-Signature": signature, "Content-Type": "application/json"},
+        )
+
+    return _post
+
+
+@pytest.fixture(scope="session")
+def fast_sqlite_pragmas():
+    """Connection pragmas for file-backed test databases.
+
+    Test databases are thrown away, so commits skip fsync. The journal stays
+    in WAL mode because the reader pool relies on it.
+    """
+    return ("PRAGMA synchronous=OFF", "PRAGMA temp_store=MEMORY")
+
+
+@pytest.fixture(scope="session")
+def empty_file(tmp_path_factory):
+    """Create empty placeholder files by hard-linking one session-wide template.
+
+    Returns a callable ``(path) -> path``. Linking is a single syscall; where
+    hard links are not supported the file is touched instead. Linked files
+    share one inode, so tests must not write to them.
+    """
+    template = tmp_path_factory.mktemp("templates") / "empty"
+    template.touch()
+
+    def _create(path: Path) -> Path:
+        try:
+            os.link(template, path)
+        except OSError:
+            path.touch()
+        return path
+
+    return _create
+
+
+@pytest.fixture(scope="session")
+def job_db_template():
+    """Serialized empty job database, initialized once per session.
+
+    Clone it with ``JobDatabase.deserialize(job_db_template)`` to get a fresh
+    in-memory database without running the schema DDL again.
+    """
+    db = JobDatabase(":memory:")
+    data = db.serialize()
+    db.close()
+    return data
+
+
+@pytest.fixture(scope="session")
 def default_config():
-    """Create a default configuration for testing."""
+    """Create a default configuration for testing (shared; do not mutate)."""
     return Config(
         language_priority=["eng", "jpn", "ita"],
         path_overrides=[
@@ -1,7 +1,7 @@
 """Integration tests for Phase 5 job management APIs."""
 
-from pathlib import Path
 from unittest.mock import patch
+from uuid import uuid4
 import pytest
 from fastapi.testclient import TestClient
 
@@ -14,21 +14,21 @@ from arrtheaudio.core.detector import ContainerType
 
 
 @pytest.fixture
-def test_config(tmp_path):
+def test_config():
     """Create test configuration."""
     return Config(language_priority=["eng"])
 
 
 @pytest.fixture
-def test_client(test_config, tmp_path):
+def test_client(test_config):
     """Create test client with job queue initialized."""
     from arrtheaudio import api
 
     app = create_app(test_config)
 
-    # Initialize queue manager
-    db_path = tmp_path / "test_jobs.db"
-    queue_manager = JobQueueManager(test_config, db_path)
+    # Initialize queue manager on a uniquely named in-memory database
+    db_uri = f"file:jobs_{uuid4().hex}?mode=memory&cache=shared"
+    queue_manager = JobQueueManager(test_config, db_uri)
 
     # Initialize worker pool (but don't start)
     pipeline = ProcessingPipeline(test_config)
@@ -45,7 +45,9 @@ def test_client(test_config, tmp_path):
         "config": test_config,
     }
 
-    return TestClient(app)
+    yield TestClient(app)
+    # The shared-cache database is freed once its last connection closes
+    queue_manager.db.close()
 
 
 @pytest.fixture
@@ -1,38 +1,79 @@
 """Integration tests for multi-file webhook fix (Phase 5 critical bug fix)."""
 
-import hmac
-import hashlib
-import json
+import functools
+import os
 from pathlib import Path
-from unittest.mock import patch
+import httpx
+import orjson
 import pytest
-from fastapi.testclient import TestClient
 
-from arrtheaudio.api.app import create_app
+from arrtheaudio.api.app import AppState, create_app
 from arrtheaudio.config import Config, PathMapping, APIConfig
 from arrtheaudio.core.queue_manager import JobQueueManager
-from arrtheaudio.core.worker_pool import WorkerPool
-from arrtheaudio.core.pipeline import ProcessingPipeline
 from arrtheaudio.core.detector import ContainerType
+from arrtheaudio.core.job_models import JobPriority, JobSource
+
+
+def _touch_many(directory: Path, names: list[str]) -> None:
+    """Create empty files with a bare open/close (no stat or utime like touch())."""
+    for name in names:
+        os.close(os.open(directory / name, os.O_WRONLY | os.O_CREAT, 0o644))
+
+
+@functools.lru_cache(maxsize=16)
+def _make_payload(n_files: int) -> dict:
+    """Build (once per size) a Sonarr payload for episodes 1..n_files.
+
+    The returned dict is shared between callers and must not be mutated.
+    Identical payloads serialize to identical bytes, so the conftest signer
+    also reuses its cached HMAC for them.
+    """
+    return {
+        "eventType": "Download",
+        "series": {
+            "id": 1,
+            "title": "Test Show",
+            "tvdbId": 12345,
+        },
+        "episodes": [
+            {"id": i, "seasonNumber": 1, "episodeNumber": i}
+            for i in range(1, n_files + 1)
+        ],
+        "episodeFiles": [
+            {"id": i, "path": f"/tv/test_show/S01E{i:02d}.mkv"}
+            for i in range(1, n_files + 1)
+        ],
+    }
 
 
-def create_signature(payload: dict, secret: str) -> str:
-    """Create HMAC signature for webhook payload."""
-    body = json.dumps(payload).encode()
-    return hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+def _json(response: httpx.Response):
+    """Decode a JSON response body with orjson."""
+    return orjson.loads(response.content)
 
 
-@pytest.fixture
-def webhook_config(tmp_path):
-    """Create configuration for webhook testing."""
-    media_dir = tmp_path / "media"
-    media_dir.mkdir()
+@pytest.fixture(scope="module", autouse=True)
+def mkv_detector():
+    """Report every file as MKV so empty test files never reach ffprobe."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(
+            "arrtheaudio.core.detector.ContainerDetector.detect",
+            lambda self, file_path: ContainerType.MKV,
+        )
+        yield
+
+
+@pytest.fixture(scope="module")
+def webhook_config(tmp_path_factory):
+    """Create configuration for webhook testing.
+
+    The media tree is built once per module: S01E01-S01E10 cover the largest
+    season pack exercised below, and no test modifies the files.
+    """
+    media_dir = tmp_path_factory.mktemp("media")
 
-    # Create test files for multi-file testing
     show_dir = media_dir / "test_show"
     show_dir.mkdir()
-    for i in range(1, 4):  # 3 episodes
-        (show_dir / f"S01E0{i}.mkv").touch()
+    _touch_many(show_dir, [f"S01E{i:02d}.mkv" for i in range(1, 11)])
 
     return Config(
         language_priority=["eng", "jpn"],
@@ -47,169 +88,92 @@ def webhook_config(tmp_path):
     )
 
 
+@pytest.fixture(scope="module")
+def app():
+    """Build the FastAPI app once per module.
+
+    Route registration and response-model compilation happen here only once;
+    each test rebinds ``app.state.arrtheaudio`` to its own config and queue.
+    """
+    return create_app(Config(api=APIConfig(webhook_secret="test_secret_key")))
+
+
 @pytest.fixture
-def test_client(webhook_config, tmp_path):
-    """Create test client with job queue."""
-    from arrtheaudio import api
+def queue_manager(webhook_config, tmp_path_factory, worker_id, fast_sqlite_pragmas):
+    """Create queue manager with a database private to this xdist worker."""
+    db_dir = tmp_path_factory.mktemp(f"queue_{worker_id}")
+    queue_manager = JobQueueManager(
+        webhook_config, db_dir / "test_jobs.db", pragmas=fast_sqlite_pragmas
+    )
+    yield queue_manager
+    queue_manager.db.close()
 
-    app = create_app(webhook_config)
 
-    # Initialize queue manager
-    db_path = tmp_path / "test_jobs.db"
-    queue_manager = JobQueueManager(webhook_config, db_path)
+@pytest.fixture
+async def test_client(app, webhook_config, queue_manager):
+    """Create async test client with job queue.
 
-    # Initialize worker pool
-    pipeline = ProcessingPipeline(webhook_config)
-    worker_pool = WorkerPool(webhook_config, queue_manager, pipeline)
+    Requests go straight into the ASGI app on the test's event loop, without
+    the thread portal that the synchronous TestClient needs.
+    """
+    from arrtheaudio import api
 
-    # Set app state
+    # Set app state. These tests only assert on enqueue-side state, so no
+    # worker pool (or processing pipeline) is created at all.
+    app.state.arrtheaudio = AppState(webhook_config)
     app.state.arrtheaudio.queue_manager = queue_manager
-    app.state.arrtheaudio.worker_pool = worker_pool
 
     # Set global state for dependency injection (needed for job_routes.py dependencies)
     api.app._app_state = {
         "queue_manager": queue_manager,
-        "worker_pool": worker_pool,
+        "worker_pool": None,
         "config": webhook_config,
     }
 
-    return TestClient(app)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
 
 
 class TestMultiFileWebhookFix:
     """Test the critical multi-file webhook bug fix."""
 
-    def test_sonarr_single_file(self, test_client):
-        """Test Sonarr webhook with single file (baseline)."""
-        payload = {
-            "eventType": "Download",
-            "series": {
-                "id": 1,
-                "title": "Test Show",
-                "tvdbId": 12345,
-            },
-            "episodes": [{"id": 1, "seasonNumber": 1, "episodeNumber": 1}],
-            "episodeFiles": [
-                {"id": 1, "path": "/tv/test_show/S01E01.mkv"},
-            ],
-        }
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("n_files", [1, 2, 3, 5, 10])
+    async def test_all_files_processed(self, test_client, signed_post, n_files):
+        """Every file in episodeFiles must become its own job (1 file up to a season pack).
 
-        signature = create_signature(payload, "test_secret_key")
+        Regression guard for the original bug where only episodeFiles[0] was
+        processed and the remaining files were silently dropped.
+        """
+        payload = _make_payload(n_files)
 
-        with patch("arrtheaudio.core.detector.ContainerDetector.detect", return_value=ContainerType.MKV):
-            response = test_client.post(
-                "/webhook/sonarr",
-                json=payload,
-                headers={"X-Webhook-Signature": signature},
-            )
+        response = await signed_post(test_client, "/webhook/sonarr", payload)
 
         assert response.status_code == 200
-        data = response.json()
+        data = _json(response)
         assert data["status"] == "accepted"
         assert "webhook_id" in data
-        assert len(data["job_ids"]) == 1
-        assert data["files_queued"] == 1
 
-    def test_sonarr_multiple_files_all_processed(self, test_client):
-        """Test Sonarr webhook with multiple files - ALL should be processed."""
-        payload = {
-            "eventType": "Download",
-            "series": {
-                "id": 1,
-                "title": "Test Show",
-                "tvdbId": 12345,
-            },
-            "episodes": [
-                {"id": 1, "seasonNumber": 1, "episodeNumber": 1},
-                {"id": 2, "seasonNumber": 1, "episodeNumber": 2},
-                {"id": 3, "seasonNumber": 1, "episodeNumber": 3},
-            ],
-            "episodeFiles": [
-                {"id": 1, "path": "/tv/test_show/S01E01.mkv"},
-                {"id": 2, "path": "/tv/test_show/S01E02.mkv"},
-                {"id": 3, "path": "/tv/test_show/S01E03.mkv"},
-            ],
-        }
-
-        signature = create_signature(payload, "test_secret_key")
+        # CRITICAL: All files should be processed, not just the first!
+        assert len(data["job_ids"]) == n_files, "All files must be processed, not just the first one!"
+        assert data["files_queued"] == n_files, "Silent data loss detected!"
 
-        with patch("arrtheaudio.core.detector.ContainerDetector.detect", return_value=ContainerType.MKV):
-            response = test_client.post(
-                "/webhook/sonarr",
-                json=payload,
-                headers={"X-Webhook-Signature": signature},
-            )
-
-        assert response.status_code == 200
-        data = response.json()
-        assert data["status"] == "accepted"
-        assert "webhook_id" in data
-
-        # CRITICAL: All 3 files should be processed, not just the first!
-        assert len(data["job_ids"]) == 3, "All files must be processed, not just the first one!"
-        assert data["files_queued"] == 3
-
-        # Verify all jobs were created
+        # Verify all jobs were created and linked to the webhook
         webhook_id = data["webhook_id"]
-        webhook_response = test_client.get(f"/api/v1/webhook/{webhook_id}")
+        webhook_response = await test_client.get(f"/api/v1/webhook/{webhook_id}")
         assert webhook_response.status_code == 200
-        webhook_data = webhook_response.json()
-        assert webhook_data["total_jobs"] == 3
-        assert len(webhook_data["jobs"]) == 3
+        webhook_data = _json(webhook_response)
+        assert webhook_data["total_jobs"] == n_files
+        assert len(webhook_data["jobs"]) == n_files
 
-        # Verify all jobs have the same webhook_id
-        job_ids = set(job["job_id"] for job in webhook_data["jobs"])
-        assert len(job_ids) == 3  # All jobs unique
+        # Every job is unique, shares the webhook_id and points at its own file
+        assert len(set(job["job_id"] for job in webhook_data["jobs"])) == n_files
         assert all(job["webhook_id"] == webhook_id for job in webhook_data["jobs"])
+        assert len(set(job["file_path"] for job in webhook_data["jobs"])) == n_files
 
-    def test_sonarr_season_pack_scenario(self, test_client):
-        """Test Sonarr webhook for season pack (10 episodes) - real-world scenario."""
-        # Simulate a season pack download with 10 episodes
-        episode_files = [
-            {"id": i, "path": f"/tv/test_show/S01E{i:02d}.mkv"}
-            for i in range(1, 11)
-        ]
-        episodes = [
-            {"id": i, "seasonNumber": 1, "episodeNumber": i}
-            for i in range(1, 11)
-        ]
-
-        payload = {
-            "eventType": "Download",
-            "series": {
-                "id": 1,
-                "title": "Test Show",
-                "tvdbId": 12345,
-            },
-            "episodes": episodes,
-            "episodeFiles": episode_files,
-        }
-
-        # Create all files
-        media_dir = Path(test_client.app.state.arrtheaudio.config.path_mappings[0].local)
-        show_dir = media_dir / "test_show"
-        show_dir.mkdir(exist_ok=True)
-        for i in range(1, 11):
-            (show_dir / f"S01E{i:02d}.mkv").touch()
-
-        signature = create_signature(payload, "test_secret_key")
-
-        with patch("arrtheaudio.core.detector.ContainerDetector.detect", return_value=ContainerType.MKV):
-            response = test_client.post(
-                "/webhook/sonarr",
-                json=payload,
-                headers={"X-Webhook-Signature": signature},
-            )
-
-        assert response.status_code == 200
-        data = response.json()
-        assert data["status"] == "accepted"
-
-        # ALL 10 episodes must be queued
-        assert len(data["job_ids"]) == 10, "Season pack: all episodes must be processed!"
-        assert data["files_queued"] == 10
-
-    def test_sonarr_partial_files_exist(self, test_client):
+    @pytest.mark.asyncio
+    async def test_sonarr_partial_files_exist(self, test_client, signed_post):
         """Test when only some files exist (should process what's available)."""
         payload = {
             "eventType": "Download",
@@ -228,24 +192,20 @@ class TestMultiFileWebhookFix:
             ],
         }
 
-        signature = create_signature(payload, "test_secret_key")
-
-        with patch("arrtheaudio.core.detector.ContainerDetector.detect", return_value=ContainerType.MKV):
-            response = test_client.post(
-                "/webhook/sonarr",
-                json=payload,
-                headers={"X-Webhook-Signature": signature},
-            )
+        response = await signed_post(test_client, "/webhook/sonarr", payload)
 
         assert response.status_code == 200
-        data = response.json()
+        data = _json(response)
         assert data["status"] == "accepted"
 
         # Only 1 file should be processed (the one that exists)
         assert len(data["job_ids"]) == 1
         assert data["files_queued"] == 1
 
-    def test_sonarr_multi_file_jobs_linked_by_webhook_id(self, test_client):
+    @pytest.mark.asyncio
+    async def test_sonarr_multi_file_jobs_linked_by_webhook_id(
+        self, test_client, queue_manager, signed_post
+    ):
         """Test that multi-file jobs are properly linked by webhook_id."""
         payload = {
             "eventType": "Download",
@@ -264,29 +224,26 @@ class TestMultiFileWebhookFix:
             ],
         }
 
-        signature = create_signature(payload, "test_secret_key")
-
-        with patch("arrtheaudio.core.detector.ContainerDetector.detect", return_value=ContainerType.MKV):
-            response = test_client.post(
-                "/webhook/sonarr",
-                json=payload,
-                headers={"X-Webhook-Signature": signature},
-            )
+        response = await signed_post(test_client, "/webhook/sonarr", payload)
 
         assert response.status_code == 200
-        data = response.json()
+        data = _json(response)
         webhook_id = data["webhook_id"]
         job_ids = data["job_ids"]
 
-        # Verify all jobs have the same webhook_id
-        for job_id in job_ids:
-            job_response = test_client.get(f"/api/v1/jobs/{job_id}")
-            job_data = job_response.json()
-            assert job_data["webhook_id"] == webhook_id
-            assert job_data["source"] == "sonarr"
-            assert job_data["priority"] == "high"  # Webhooks are high priority
-
-    def test_sonarr_multi_file_different_tmdb_metadata(self, test_client):
+        # Verify all jobs have the same webhook_id (GET /api/v1/jobs/{id} is
+        # covered by test_job_apis.py, so read the queue directly here)
+        jobs = queue_manager.db.get_jobs_by_webhook(webhook_id)
+        assert sorted(job.job_id for job in jobs) == sorted(job_ids)
+        for job in jobs:
+            assert job.webhook_id == webhook_id
+            assert job.source == JobSource.SONARR
+            assert job.priority == JobPriority.HIGH  # Webhooks are high priority
+
+    @pytest.mark.asyncio
+    async def test_sonarr_multi_file_different_tmdb_metadata(
+        self, test_client, queue_manager, signed_post
+    ):
         """Test that TMDB metadata is preserved for multi-file webhooks."""
         payload = {
             "eventType": "Download",
@@ -310,103 +267,16 @@ class TestMultiFileWebhookFix:
             ],
         }
 
-        signature = create_signature(payload, "test_secret_key")
-
-        with patch("arrtheaudio.core.detector.ContainerDetector.detect", return_value=ContainerType.MKV):
-            response = test_client.post(
-                "/webhook/sonarr",
-                json=payload,
-                headers={"X-Webhook-Signature": signature},
-            )
+        response = await signed_post(test_client, "/webhook/sonarr", payload)
 
         assert response.status_code == 200
-        data = response.json()
+        data = _json(response)
 
         # Verify metadata is set on all jobs
-        queue_manager = test_client.app.state.arrtheaudio.queue_manager
-        import asyncio
-        jobs = asyncio.run(queue_manager.get_jobs_by_webhook(data["webhook_id"]))
+        jobs = queue_manager.db.get_jobs_by_webhook(data["webhook_id"])
+        assert len(jobs) == 2
 
         for job in jobs:
             assert job.tmdb_id == 67890
             assert job.original_language == "Japanese"
             assert job.series_title == "Anime Show"
-
-
-class TestMultiFileWebhookRegressionPrevention:
-    """Regression tests to ensure the bug doesn't come back."""
-
-    def test_episodeFiles_array_not_truncated(self, test_client):
-        """Ensure episodeFiles array is not truncated to first element."""
-        payload = {
-            "eventType": "Download",
-            "series": {"id": 1, "title": "Test", "tvdbId": 12345},
-            "episodes": [
-                {"id": 1, "seasonNumber": 1, "episodeNumber": 1},
-                {"id": 2, "seasonNumber": 1, "episodeNumber": 2},
-            ],
-            "episodeFiles": [
-                {"id": 1, "path": "/tv/test_show/S01E01.mkv"},
-                {"id": 2, "path": "/tv/test_show/S01E02.mkv"},
-            ],
-        }
-
-        signature = create_signature(payload, "test_secret_key")
-
-        with patch("arrtheaudio.core.detector.ContainerDetector.detect", return_value=ContainerType.MKV):
-            response = test_client.post(
-                "/webhook/sonarr",
-                json=payload,
-                headers={"X-Webhook-Signature": signature},
-            )
-
-        data = response.json()
-
-        # The bug was: only job_ids[0] would exist
-        # Fix: all job_ids should exist
-        assert len(data["job_ids"]) == 2, "Regression: Only first file processed!"
-
-        # Verify both files are in different jobs
-        file_paths = []
-        for job_id in data["job_ids"]:
-            job_response = test_client.get(f"/api/v1/jobs/{job_id}")
-            file_paths.append(job_response.json()["file_path"])
-
-        assert len(set(file_paths)) == 2, "Jobs should have different file paths!"
-
-    def test_no_silent_data_loss(self, test_client):
-        """Ensure no files are silently dropped without warning."""
-        payload = {
-            "eventType": "Download",
-            "series": {"id": 1, "title": "Test", "tvdbId": 12345},
-            "episodes": [
-                {"id": i, "seasonNumber": 1, "episodeNumber": i}
-                for i in range(1, 6)
-            ],
-            "episodeFiles": [
-                {"id": i, "path": f"/tv/test_show/S01E{i:02d}.mkv"}
-                for i in range(1, 6)
-            ],
-        }
-
-        # Create files
-        media_dir = Path(test_client.app.state.arrtheaudio.config.path_mappings[0].local)
-        show_dir = media_dir / "test_show"
-        show_dir.mkdir(exist_ok=True)
-        for i in range(1, 6):
-            (show_dir / f"S01E{i:02d}.mkv").touch()
-
-        signature = create_signature(payload, "test_secret_key")
-
-        with patch("arrtheaudio.core.detector.ContainerDetector.detect", return_value=ContainerType.MKV):
-            response = test_client.post(
-                "/webhook/sonarr",
-                json=payload,
-                headers={"X-Webhook-Signature": signature},
-            )
-
-        data = response.json()
-
-        # ALL files must be accounted for
-        assert data["files_queued"] == 5, "Silent data loss detected!"
-        assert len(data["job_ids"]) == 5, "Not all files were queued!"
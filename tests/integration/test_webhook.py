@@ -1,29 +1,28 @@
 """Integration tests for webhook endpoints."""
 
-import hmac
-import hashlib
-import json
-from pathlib import Path
-from unittest.mock import Mock, patch
+from unittest.mock import patch
 
 import pytest
 from fastapi.testclient import TestClient
 
 from arrtheaudio.api.app import create_app
+from arrtheaudio.api.routes import verify_webhook_signature
 from arrtheaudio.config import Config, PathMapping, APIConfig
 
 
-@pytest.fixture
-def webhook_config(tmp_path):
-    """Create configuration for webhook testing."""
-    # Create test media directory
-    media_dir = tmp_path / "media"
-    media_dir.mkdir()
+@pytest.fixture(scope="module")
+def webhook_config(tmp_path_factory):
+    """Create configuration for webhook testing.
 
-    # Create a test file
-    test_file = media_dir / "test_show" / "S01E01.mkv"
-    test_file.parent.mkdir(parents=True)
-    test_file.touch()
+    The media tree (``test_show/`` and ``mapped_show/``) is built once per
+    module; no test modifies it.
+    """
+    media_dir = tmp_path_factory.mktemp("media")
+
+    for show in ("test_show", "mapped_show"):
+        test_file = media_dir / show / "S01E01.mkv"
+        test_file.parent.mkdir()
+        test_file.touch()
 
     return Config(
         language_priority=["eng", "jpn"],
@@ -40,7 +39,7 @@ def webhook_config(tmp_path):
 
 
 @pytest.fixture
-def test_client(webhook_config, tmp_path):
+def test_client(webhook_config, tmp_path_factory, worker_id, fast_sqlite_pragmas):
     """Create a test client for the FastAPI app with job queue."""
     from arrtheaudio.core.queue_manager import JobQueueManager
     from arrtheaudio.core.worker_pool import WorkerPool
@@ -49,8 +48,8 @@ def test_client(webhook_config, tmp_path):
     app = create_app(webhook_config)
 
     # Initialize queue manager for testing
-    db_path = tmp_path / "test_jobs.db"
-    queue_manager = JobQueueManager(webhook_config, db_path)
+    db_path = tmp_path_factory.mktemp(f"queue_{worker_id}") / "test_jobs.db"
+    queue_manager = JobQueueManager(webhook_config, db_path, pragmas=fast_sqlite_pragmas)
 
     # Initialize worker pool (but don't start it for tests)
     pipeline = ProcessingPipeline(webhook_config)
@@ -60,27 +59,72 @@ def test_client(webhook_config, tmp_path):
     app.state.arrtheaudio.queue_manager = queue_manager
     app.state.arrtheaudio.worker_pool = worker_pool
 
-    return TestClient(app)
-
+    # Not entered as a context manager: the lifespan would replace the queue
+    # manager with one on the configured database and start the workers.
+    yield TestClient(app)
+    queue_manager.db.close()
 
-def create_signature(payload: dict, secret: str) -> str:
-    """Create HMAC signature for webhook payload.
 
-    Args:
-        payload: Webhook payload dictionary
-        secret: Shared secret
+class TestWebhookSignature:
+    """Test HMAC verification without going through the ASGI stack.
 
-    Returns:
-        HMAC signature as hex string
+    Only the missing-header 401 is tested through the routes below: that
+    branch never reaches the verifier.
     """
-    body = json.dumps(payload).encode()
-    return hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+    PAYLOAD = {
+        "eventType": "Download",
+        "series": {"id": 1, "title": "Test", "tvdbId": 12345},
+        "episodes": [{"id": 1, "seasonNumber": 1, "episodeNumber": 1}],
+        "episodeFiles": [{"id": 1, "path": "/tv/test.mkv"}],
+    }
+
+    def test_valid_signature(self, signed_payload):
+        """Test that a correctly signed body verifies."""
+        body, signature = signed_payload(self.PAYLOAD)
+
+        assert verify_webhook_signature(body, signature, "test_secret_key")
+
+    def test_invalid_signature(self, signed_payload):
+        """Test that a garbage signature is rejected."""
+        body, _ = signed_payload(self.PAYLOAD)
+
+        assert not verify_webhook_signature(body, "invalid_signature", "test_secret_key")
+
+    def test_truncated_signature(self, signed_payload):
+        """Test that a valid hex prefix of the signature is rejected."""
+        body, signature = signed_payload(self.PAYLOAD)
+
+        assert not verify_webhook_signature(body, signature[:-2], "test_secret_key")
+
+    def test_missing_signature(self, signed_payload):
+        """Test that an empty signature is rejected."""
+        body, _ = signed_payload(self.PAYLOAD)
+
+        assert not verify_webhook_signature(body, "", "test_secret_key")
+
+    @pytest.mark.parametrize(
+        "mangle",
+        [str.upper, lambda s: f" {s}", lambda s: f"{s[:32]} {s[32:]}"],
+        ids=["uppercase", "leading-space", "inner-space"],
+    )
+    def test_non_canonical_signature(self, signed_payload, mangle):
+        """Test that only the exact lowercase hexdigest form is accepted."""
+        body, signature = signed_payload(self.PAYLOAD)
+
+        assert not verify_webhook_signature(body, mangle(signature), "test_secret_key")
+
+    def test_wrong_secret(self, signed_payload):
+        """Test that a signature made with another secret is rejected."""
+        body, signature = signed_payload(self.PAYLOAD, secret="other_secret")
+
+        assert not verify_webhook_signature(body, signature, "test_secret_key")
 
 
 class TestSonarrWebhook:
     """Tests for Sonarr webhook endpoint."""
 
-    def test_sonarr_webhook_success(self, test_client, webhook_config):
+    def test_sonarr_webhook_success(self, test_client, signed_post):
         """Test successful Sonarr webhook processing."""
         payload = {
             "eventType": "Download",
@@ -111,18 +155,12 @@ class TestSonarrWebhook:
             ],
         }
 
-        signature = create_signature(payload, "test_secret_key")
-
         with patch("arrtheaudio.core.detector.ContainerDetector.detect") as mock_detect:
             # Mock container detection to avoid ffprobe on empty files
             from arrtheaudio.core.detector import ContainerType
             mock_detect.return_value = ContainerType.MKV
 
-            response = test_client.post(
-                "/webhook/sonarr",
-                json=payload,
-                headers={"X-Webhook-Signature": signature},
-            )
+            response = signed_post(test_client, "/webhook/sonarr", payload)
 
         assert response.status_code == 200
         data = response.json()
@@ -133,24 +171,6 @@ class TestSonarrWebhook:
         assert len(data["job_ids"]) == 1  # One file in episodeFiles
         assert data["files_queued"] == 1
 
-    def test_sonarr_webhook_invalid_signature(self, test_client):
-        """Test Sonarr webhook with invalid signature."""
-        payload = {
-            "eventType": "Download",
-            "series": {"id": 1, "title": "Test", "tvdbId": 12345},
-            "episodes": [{"id": 1, "seasonNumber": 1, "episodeNumber": 1}],
-            "episodeFiles": [{"id": 1, "path": "/tv/test.mkv"}],
-        }
-
-        response = test_client.post(
-            "/webhook/sonarr",
-            json=payload,
-            headers={"X-Webhook-Signature": "invalid_signature"},
-        )
-
-        assert response.status_code == 401
-        assert "Invalid signature" in response.json()["detail"]
-
     def test_sonarr_webhook_missing_signature(self, test_client):
         """Test Sonarr webhook with missing signature."""
         payload = {
@@ -165,7 +185,7 @@ class TestSonarrWebhook:
         assert response.status_code == 401
         assert "Missing signature" in response.json()["detail"]
 
-    def test_sonarr_webhook_file_not_found(self, test_client):
+    def test_sonarr_webhook_file_not_found(self, test_client, signed_post):
         """Test Sonarr webhook when file doesn't exist."""
         payload = {
             "eventType": "Download",
@@ -174,20 +194,14 @@ class TestSonarrWebhook:
             "episodeFiles": [{"id": 1, "path": "/tv/nonexistent/S01E01.mkv"}],
         }
 
-        signature = create_signature(payload, "test_secret_key")
-
-        response = test_client.post(
-            "/webhook/sonarr",
-            json=payload,
-            headers={"X-Webhook-Signature": signature},
-        )
+        response = signed_post(test_client, "/webhook/sonarr", payload)
 
         assert response.status_code == 200
         data = response.json()
         assert data["status"] == "rejected"
         assert "failed to create jobs" in data["message"].lower()
 
-    def test_sonarr_webhook_missing_file_path(self, test_client):
+    def test_sonarr_webhook_missing_file_path(self, test_client, signed_post):
         """Test Sonarr webhook with missing file path."""
         payload = {
             "eventType": "Download",
@@ -196,13 +210,7 @@ class TestSonarrWebhook:
             # No episodeFiles
         }
 
-        signature = create_signature(payload, "test_secret_key")
-
-        response = test_client.post(
-            "/webhook/sonarr",
-            json=payload,
-            headers={"X-Webhook-Signature": signature},
-        )
+        response = signed_post(test_client, "/webhook/sonarr", payload)
 
         assert response.status_code == 200
         data = response.json()
@@ -213,7 +221,7 @@ class TestSonarrWebhook:
 class TestRadarrWebhook:
     """Tests for Radarr webhook endpoint."""
 
-    def test_radarr_webhook_success(self, test_client, webhook_config):
+    def test_radarr_webhook_success(self, test_client, signed_post):
         """Test successful Radarr webhook processing."""
         payload = {
             "eventType": "Download",
@@ -235,18 +243,12 @@ class TestRadarrWebhook:
             },
         }
 
-        signature = create_signature(payload, "test_secret_key")
-
         with patch("arrtheaudio.core.detector.ContainerDetector.detect") as mock_detect:
             # Mock container detection to avoid ffprobe on empty files
             from arrtheaudio.core.detector import ContainerType
             mock_detect.return_value = ContainerType.MKV
 
-            response = test_client.post(
-                "/webhook/radarr",
-                json=payload,
-                headers={"X-Webhook-Signature": signature},
-            )
+            response = signed_post(test_client, "/webhook/radarr", payload)
 
         assert response.status_code == 200
         data = response.json()
@@ -257,24 +259,20 @@ class TestRadarrWebhook:
         assert len(data["job_ids"]) == 1  # One movie file
         assert data["files_queued"] == 1
 
-    def test_radarr_webhook_invalid_signature(self, test_client):
-        """Test Radarr webhook with invalid signature."""
+    def test_radarr_webhook_missing_signature(self, test_client):
+        """Test Radarr webhook with missing signature."""
         payload = {
             "eventType": "Download",
             "movie": {"id": 1, "title": "Test", "year": 2023, "tmdbId": 12345},
             "movieFile": {"id": 1, "path": "/movies/test.mkv"},
         }
 
-        response = test_client.post(
-            "/webhook/radarr",
-            json=payload,
-            headers={"X-Webhook-Signature": "invalid_signature"},
-        )
+        response = test_client.post("/webhook/radarr", json=payload)
 
         assert response.status_code == 401
-        assert "Invalid signature" in response.json()["detail"]
+        assert "Missing signature" in response.json()["detail"]
 
-    def test_radarr_webhook_file_not_found(self, test_client):
+    def test_radarr_webhook_file_not_found(self, test_client, signed_post):
         """Test Radarr webhook when file doesn't exist."""
         payload = {
             "eventType": "Download",
@@ -282,13 +280,7 @@ class TestRadarrWebhook:
             "movieFile": {"id": 1, "path": "/movies/nonexistent.mkv"},
         }
 
-        signature = create_signature(payload, "test_secret_key")
-
-        response = test_client.post(
-            "/webhook/radarr",
-            json=payload,
-            headers={"X-Webhook-Signature": signature},
-        )
+        response = signed_post(test_client, "/webhook/radarr", payload)
 
         assert response.status_code == 200
         data = response.json()
@@ -313,14 +305,8 @@ class TestHealthEndpoint:
 class TestPathMapping:
     """Tests for path mapping in webhooks."""
 
-    def test_path_mapping_applied(self, test_client, webhook_config):
+    def test_path_mapping_applied(self, test_client, signed_post):
         """Test that path mapping is correctly applied."""
-        # Create a file at the mapped location
-        media_dir = Path(webhook_config.path_mappings[0].local)
-        test_file = media_dir / "mapped_show" / "S01E01.mkv"
-        test_file.parent.mkdir(parents=True, exist_ok=True)
-        test_file.touch()
-
         payload = {
             "eventType": "Download",
             "series": {"id": 1, "title": "Test", "tvdbId": 12345},
@@ -328,18 +314,12 @@ class TestPathMapping:
             "episodeFiles": [{"id": 1, "path": "/tv/mapped_show/S01E01.mkv"}],
         }
 
-        signature = create_signature(payload, "test_secret_key")
-
         with patch("arrtheaudio.core.detector.ContainerDetector.detect") as mock_detect:
             # Mock container detection to avoid ffprobe on empty files
             from arrtheaudio.core.detector import ContainerType
             mock_detect.return_value = ContainerType.MKV
 
-            response = test_client.post(
-                "/webhook/sonarr",
-                json=payload,
-                headers={"X-Webhook-Signature": signature},
-            )
+            response = signed_post(test_client, "/webhook/sonarr", payload)
 
         assert response.status_code == 200
         data = response.json()
@@ -1,17 +1,30 @@
 """Unit tests for job database."""
 
-from pathlib import Path
+from datetime import datetime
+import sqlite3
 import pytest
 
-from arrtheaudio.core.database import JobDatabase
-from arrtheaudio.core.job_models import Job, JobStatus, JobPriority, JobSource
+from arrtheaudio.core.database import (
+    COUNT_BY_STATUS_CONTAINER_SQL,
+    DELETE_FINISHED_BEFORE_SQL,
+    JOB_COLUMNS,
+    QUEUED_CODE,
+    RUNNING_CODE,
+    SCHEMA_VERSION,
+    SELECT_JOBS_BY_BATCH_SQL,
+    SELECT_JOBS_BY_WEBHOOK_SQL,
+    SELECT_NEXT_JOB_SQL,
+    JobDatabase,
+)
+from arrtheaudio.core.job_models import Job, JobStatus, JobPriority, JobSource, to_epoch_us
 
 
 @pytest.fixture
-def db(tmp_path):
-    """Create a test database."""
-    db_path = tmp_path / "test_jobs.db"
-    return JobDatabase(db_path)
+def db():
+    """Create an in-memory test database."""
+    database = JobDatabase(":memory:")
+    yield database
+    database.close()
 
 
 @pytest.fixture
@@ -35,6 +48,161 @@ class TestJobDatabase:
 
         assert db_path.exists()
         assert db.db_path == db_path
+        db.close()
+
+    def test_database_uses_wal(self, tmp_path):
+        """Test database runs in WAL mode with connection pragmas applied."""
+        db = JobDatabase(tmp_path / "test.db")
+        with db._get_connection() as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+            assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 30000
+        db.close()
+
+    def test_migrates_text_enum_columns(self, tmp_path):
+        """Test a version 0 table (TEXT enums and timestamps) is rebuilt as integers."""
+        db_path = tmp_path / "legacy.db"
+        conn = sqlite3.connect(db_path)
+        conn.execute(
+            "CREATE TABLE jobs (job_id TEXT PRIMARY KEY, file_path TEXT NOT NULL, "
+            "container TEXT NOT NULL, status TEXT NOT NULL, priority TEXT NOT NULL, "
+            "source TEXT NOT NULL, webhook_id TEXT, batch_id TEXT, "
+            "selected_track_index INTEGER, selected_track_language TEXT, "
+            "created_at TEXT NOT NULL, started_at TEXT, completed_at TEXT, "
+            "success INTEGER, error_message TEXT, retry_count INTEGER DEFAULT 0, "
+            "tmdb_id INTEGER, original_language TEXT, series_title TEXT, movie_title TEXT)"
+        )
+        conn.execute("CREATE INDEX idx_status ON jobs(status)")
+        conn.execute(
+            "INSERT INTO jobs (job_id, file_path, container, status, priority, source, "
+            "created_at, completed_at) VALUES ('job_legacy', '/media/old.mkv', 'mkv', "
+            "'failed', 'high', 'radarr', '2024-01-01T12:00:00', '2024-01-01T12:00:02.000250')"
+        )
+        conn.commit()
+        conn.close()
+
+        db = JobDatabase(db_path)
+        job = db.get_job("job_legacy")
+
+        assert job.status == JobStatus.FAILED
+        assert job.priority == JobPriority.HIGH
+        assert job.source == JobSource.RADARR
+        assert job.created_at == datetime(2024, 1, 1, 12, 0, 0)
+        assert job.started_at is None
+        assert job.completed_at == datetime(2024, 1, 1, 12, 0, 2, 250)
+        with db._get_connection() as conn:
+            assert conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+            assert conn.execute("SELECT status, created_at FROM jobs").fetchone()[:] == (
+                3,
+                1704110400000000,
+            )
+        db.close()
+
+    def test_drops_redundant_status_index(self, tmp_path):
+        """Test an existing database loses idx_status, which the composite indexes cover."""
+        db_path = tmp_path / "test.db"
+        JobDatabase(db_path).close()
+        conn = sqlite3.connect(db_path)
+        conn.execute("CREATE INDEX idx_status ON jobs(status)")
+        conn.commit()
+        conn.close()
+
+        db = JobDatabase(db_path)
+        with db._get_connection() as conn:
+            indexes = {
+                row["name"]
+                for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+            }
+        db.close()
+
+        assert "idx_status" not in indexes
+        assert "idx_jobs_status_priority_created" in indexes
+
+    @pytest.mark.parametrize(
+        "uri",
+        ["file::memory:", "file:jobs_test?mode=memory&cache=shared"],
+        ids=["anonymous", "named"],
+    )
+    def test_in_memory_uri(self, uri, sample_job):
+        """Test in-memory URIs open a working database on a single connection."""
+        db = JobDatabase(uri)
+
+        assert db.add_job(sample_job) is True
+        assert db.get_job(sample_job.job_id) is not None
+        assert db._pool._readers.maxsize == 0
+        db.close()
+
+    def test_file_uri(self, tmp_path, sample_job):
+        """Test file URIs open a file database with the reader pool."""
+        db = JobDatabase(f"file:{tmp_path / 'test.db'}?mode=rwc")
+
+        assert db.add_job(sample_job) is True
+        assert db.get_job(sample_job.job_id) is not None
+        assert (tmp_path / "test.db").exists()
+        db.close()
+
+    def test_deserialize_clones_database(self, db, sample_job):
+        """Test a deserialized copy has the schema and rows but is independent."""
+        db.add_job(sample_job)
+
+        clone = JobDatabase.deserialize(db.serialize())
+        clone.delete_job(sample_job.job_id)
+
+        assert clone.get_job(sample_job.job_id) is None
+        assert db.get_job(sample_job.job_id) is not None
+        assert clone.add_job(sample_job) is True
+        clone.close()
+
+    def test_extra_pragmas_applied(self, tmp_path):
+        """Test extra pragmas run on every connection after the defaults."""
+        db = JobDatabase(tmp_path / "test.db", pragmas=("PRAGMA synchronous=OFF",))
+        with db._get_connection() as conn:
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 0  # OFF
+            assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 30000
+        db.close()
+
+    def test_job_columns_match_job_model(self, sample_job):
+        """Test JOB_COLUMNS follows Job.to_db_dict(), which Job.from_db_row relies on."""
+        assert JOB_COLUMNS == tuple(sample_job.to_db_dict())
+
+    def test_close_is_idempotent(self):
+        """Test closing a database twice is harmless."""
+        db = JobDatabase(":memory:")
+        db.close()
+        db.close()
+
+    def test_reads_fail_after_close(self, tmp_path, sample_job):
+        """Test reads on a closed pooled database fail instead of blocking."""
+        db = JobDatabase(tmp_path / "test.db")
+        db.add_job(sample_job)
+        db.close()
+
+        with pytest.raises(sqlite3.ProgrammingError):
+            with db._pool.reader():
+                pass
+        assert db.get_job(sample_job.job_id) is None
+
+    def test_in_memory_databases_are_isolated(self, db, sample_job):
+        """Test each in-memory database is private to its instance."""
+        other = JobDatabase(":memory:")
+        db.add_job(sample_job)
+
+        assert db.get_job(sample_job.job_id) is not None
+        assert other.get_job(sample_job.job_id) is None
+        other.close()
+
+    def test_failed_transaction_rolls_back(self, db, sample_job):
+        """Test a write transaction is rolled back when it raises."""
+        db.add_job(sample_job)
+
+        with pytest.raises(RuntimeError):
+            with db._transaction() as conn:
+                conn.execute(
+                    "DELETE FROM jobs WHERE job_id = ?", (sample_job.job_id,)
+                )
+                raise RuntimeError("boom")
+
+        assert db.get_job(sample_job.job_id) is not None
 
     def test_add_job(self, db, sample_job):
         """Test adding a job to database."""
@@ -48,6 +216,35 @@ class TestJobDatabase:
         assert retrieved.job_id == sample_job.job_id
         assert retrieved.file_path == sample_job.file_path
 
+    def test_add_jobs(self, db):
+        """Test adding several jobs in one transaction."""
+        jobs = [
+            Job(
+                file_path=f"/media/test{i}.mkv",
+                container="mkv",
+                source=JobSource.MANUAL,
+                priority=JobPriority.NORMAL,
+            )
+            for i in range(3)
+        ]
+
+        assert db.add_jobs(jobs) is True
+        assert db.get_queue_stats()["queued"] == 3
+
+    def test_add_jobs_is_atomic(self, db, sample_job):
+        """Test that a failing row rolls back the whole batch."""
+        db.add_job(sample_job)
+        new_job = Job(
+            file_path="/media/new.mkv",
+            container="mkv",
+            source=JobSource.MANUAL,
+            priority=JobPriority.NORMAL,
+        )
+
+        # sample_job's job_id already exists, so the batch must fail as a whole
+        assert db.add_jobs([new_job, sample_job]) is False
+        assert db.get_job(new_job.job_id) is None
+
     def test_get_job_not_found(self, db):
         """Test getting a non-existent job."""
         result = db.get_job("nonexistent_job")
@@ -94,15 +291,45 @@ class TestJobDatabase:
         )
 
         # Add in random order
-        db.add_job(job_low)
-        db.add_job(job_high)
-        db.add_job(job_normal)
+        db.add_jobs([job_low, job_high, job_normal])
 
         # Get next job - should be high priority
         next_job = db.get_next_job()
         assert next_job.priority == JobPriority.HIGH
         assert next_job.file_path == "/media/high.mkv"
 
+    def test_get_next_job_uses_index(self, db):
+        """Test the dequeue query is an index search without a sort step."""
+        with db._get_connection() as conn:
+            plan = conn.execute(
+                f"EXPLAIN QUERY PLAN {SELECT_NEXT_JOB_SQL}", (QUEUED_CODE,)
+            ).fetchall()
+
+        details = " ".join(row["detail"] for row in plan)
+        assert "USING INDEX idx_jobs_status_priority_created" in details
+        assert "TEMP B-TREE" not in details
+
+    @pytest.mark.parametrize(
+        "sql, params, index",
+        [
+            (SELECT_JOBS_BY_WEBHOOK_SQL, ("webhook_test",), "idx_jobs_webhook_id"),
+            (SELECT_JOBS_BY_BATCH_SQL, ("batch_test",), "idx_jobs_batch_id"),
+            (
+                COUNT_BY_STATUS_CONTAINER_SQL,
+                (RUNNING_CODE, "mp4"),
+                "idx_jobs_status_container",
+            ),
+        ],
+    )
+    def test_lookup_queries_use_index(self, db, sql, params, index):
+        """Test webhook, batch and running-container lookups are index searches."""
+        with db._get_connection() as conn:
+            plan = conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+
+        details = " ".join(row["detail"] for row in plan)
+        assert index in details
+        assert "TEMP B-TREE" not in details
+
     def test_get_next_job_no_queued_jobs(self, db, sample_job):
         """Test get_next_job when no jobs are queued."""
         # Add a running job
@@ -112,42 +339,6 @@ class TestJobDatabase:
         next_job = db.get_next_job()
         assert next_job is None
 
-    def test_get_jobs_by_status(self, db):
-        """Test getting jobs by status."""
-        # Create jobs with different statuses
-        job1 = Job(
-            file_path="/media/queued.mkv",
-            container="mkv",
-            source=JobSource.MANUAL,
-            status=JobStatus.QUEUED,
-        )
-        job2 = Job(
-            file_path="/media/running.mkv",
-            container="mkv",
-            source=JobSource.MANUAL,
-            status=JobStatus.RUNNING,
-        )
-        job3 = Job(
-            file_path="/media/completed.mkv",
-            container="mkv",
-            source=JobSource.MANUAL,
-            status=JobStatus.COMPLETED,
-        )
-
-        db.add_job(job1)
-        db.add_job(job2)
-        db.add_job(job3)
-
-        # Get queued jobs
-        queued = db.get_jobs_by_status(JobStatus.QUEUED)
-        assert len(queued) == 1
-        assert queued[0].status == JobStatus.QUEUED
-
-        # Get running jobs
-        running = db.get_jobs_by_status(JobStatus.RUNNING)
-        assert len(running) == 1
-        assert running[0].status == JobStatus.RUNNING
-
     def test_get_jobs_by_webhook(self, db):
         """Test getting jobs by webhook ID."""
         webhook_id = "webhook_test123"
@@ -172,9 +363,7 @@ class TestJobDatabase:
             webhook_id=None,
         )
 
-        db.add_job(job1)
-        db.add_job(job2)
-        db.add_job(job3)
+        db.add_jobs([job1, job2, job3])
 
         # Get jobs by webhook
         webhook_jobs = db.get_jobs_by_webhook(webhook_id)
@@ -199,8 +388,7 @@ class TestJobDatabase:
             batch_id=batch_id,
         )
 
-        db.add_job(job1)
-        db.add_job(job2)
+        db.add_jobs([job1, job2])
 
         # Get jobs by batch
         batch_jobs = db.get_jobs_by_batch(batch_id)
@@ -223,8 +411,7 @@ class TestJobDatabase:
             )
         ]
 
-        for job in jobs:
-            db.add_job(job)
+        db.add_jobs(jobs)
 
         stats = db.get_queue_stats()
 
@@ -263,10 +450,7 @@ class TestJobDatabase:
             status=JobStatus.QUEUED,
         )
 
-        db.add_job(mkv_job)
-        db.add_job(mp4_job1)
-        db.add_job(mp4_job2)
-        db.add_job(mp4_queued)
+        db.add_jobs([mkv_job, mp4_job1, mp4_job2, mp4_queued])
 
         # Count running MP4 jobs
         mp4_count = db.count_running_by_container("mp4")
@@ -310,13 +494,84 @@ class TestJobDatabase:
             status=JobStatus.COMPLETED,
         )
 
-        db.add_job(old_job)
-        db.add_job(recent_job)
+        db.add_jobs([old_job, recent_job])
 
         # Cleanup jobs older than 30 days
         deleted = db.cleanup_old_jobs(days=30)
 
-        # Note: The cleanup function checks completed_at against a cutoff
-        # Since we're using fake timestamps, this might not delete as expected in test
-        # The function is tested for logic, actual deletion depends on datetime comparison
-        assert deleted >= 0  # At least doesn't error
+        assert deleted == 1
+        assert db.get_job(old_job.job_id) is None
+        assert db.get_job(recent_job.job_id) is not None
+
+        # Deleting rows refreshes planner statistics
+        with db._get_connection() as conn:
+            stats = conn.execute("SELECT idx FROM sqlite_stat1 WHERE tbl = 'jobs'").fetchall()
+        assert stats
+
+    def test_analyze(self, db, sample_job):
+        """Test analyze collects statistics for the job indexes."""
+        db.add_job(sample_job)
+
+        assert db.analyze() is True
+
+        with db._get_connection() as conn:
+            indexes = {
+                row["idx"]
+                for row in conn.execute("SELECT idx FROM sqlite_stat1 WHERE tbl = 'jobs'")
+            }
+        assert "idx_jobs_status_priority_created" in indexes
+
+    def test_cleanup_old_jobs_uses_index(self, db):
+        """Test cleanup is an index search rather than a table scan.
+
+        Which index wins depends on ANALYZE statistics; on a populated table
+        it is the partial idx_jobs_completed_at.
+        """
+        with db._get_connection() as conn:
+            plan = conn.execute(
+                f"EXPLAIN QUERY PLAN {DELETE_FINISHED_BEFORE_SQL}",
+                (to_epoch_us(datetime(2024, 1, 1)),),
+            ).fetchall()
+
+        details = " ".join(row["detail"] for row in plan)
+        assert "SEARCH jobs USING INDEX" in details
+        assert "SCAN" not in details
+
+
+@pytest.fixture(scope="class")
+def status_db():
+    """Create a database with one job per status (read-only for the tests)."""
+    database = JobDatabase(":memory:")
+    database.add_jobs(
+        [
+            Job(
+                file_path=f"/media/{status.value}.mkv",
+                container="mkv",
+                source=JobSource.MANUAL,
+                status=status,
+            )
+            for status in (JobStatus.QUEUED, JobStatus.RUNNING, JobStatus.COMPLETED)
+        ]
+    )
+    yield database
+    database.close()
+
+
+class TestGetJobsByStatus:
+    """Test JobDatabase.get_jobs_by_status against one shared database."""
+
+    @pytest.mark.parametrize(
+        "status, expected",
+        [
+            (JobStatus.QUEUED, 1),
+            (JobStatus.RUNNING, 1),
+            (JobStatus.COMPLETED, 1),
+            (JobStatus.FAILED, 0),
+        ],
+    )
+    def test_get_jobs_by_status(self, status_db, status, expected):
+        """Test getting jobs by status."""
+        jobs = status_db.get_jobs_by_status(status)
+
+        assert len(jobs) == expected
+        assert all(job.status == status for job in jobs)
@@ -1,12 +1,44 @@
 """Unit tests for audio track executors."""
 
+import os
 import subprocess
 from pathlib import Path
-from unittest.mock import MagicMock, Mock, patch
+from unittest.mock import Mock, patch
 
 import pytest
 
-from arrtheaudio.core.executor import MP4Executor, MKVExecutor, get_executor
+from arrtheaudio.core.executor import (
+    MP4Executor,
+    MKVExecutor,
+    _backup_atomic,
+    _cached_executor,
+    _find_ffmpeg,
+    _find_ffprobe,
+    get_executor,
+)
+
+
+MiB = 1024 * 1024
+
+
+def _sparse_file(path: Path, size: int) -> None:
+    """Create a file of the given logical size without writing data blocks.
+
+    The executor only looks at st_size, so the contents never matter.
+    """
+    path.touch()
+    os.truncate(path, size)
+
+
+@pytest.fixture(autouse=True)
+def clear_tool_cache():
+    """Forget cached tool lookups and executors so shutil.which patches take effect."""
+    caches = (_find_ffmpeg, _find_ffprobe, _cached_executor)
+    for cache in caches:
+        cache.cache_clear()
+    yield
+    for cache in caches:
+        cache.cache_clear()
 
 
 class TestMP4Executor:
@@ -16,8 +48,7 @@ class TestMP4Executor:
     def mock_file(self, tmp_path):
         """Create a mock MP4 file."""
         file_path = tmp_path / "test.mp4"
-        # Create a file with some content (10 MB)
-        file_path.write_bytes(b"0" * (10 * 1024 * 1024))
+        _sparse_file(file_path, 10 * MiB)
         return file_path
 
     @pytest.fixture
@@ -34,21 +65,20 @@ class TestMP4Executor:
 
     def test_get_audio_track_count_success(self, executor, mock_file):
         """Test getting audio track count."""
-        mock_output = {
-            "streams": [
-                {"codec_type": "audio", "index": 0},
-                {"codec_type": "audio", "index": 1},
-            ]
-        }
-
         with patch("subprocess.run") as mock_run:
             mock_run.return_value = Mock(
                 returncode=0,
-                stdout='{"streams": [{"codec_type": "audio"}, {"codec_type": "audio"}]}',
+                stdout="0\n1\n",
             )
-            count = executor._get_audio_track_count(mock_file)
+            with patch("shutil.which", return_value="/usr/bin/ffprobe"):
+                count = executor._get_audio_track_count(mock_file)
             assert count == 2
 
+        # Absolute executable and close_fds=False keep the call posix_spawn-eligible
+        args, kwargs = mock_run.call_args
+        assert args[0][0] == "/usr/bin/ffprobe"
+        assert kwargs["close_fds"] is False
+
     def test_get_audio_track_count_failure(self, executor, mock_file):
         """Test getting audio track count when ffprobe fails."""
         with patch("subprocess.run", side_effect=subprocess.CalledProcessError(1, "ffprobe")):
@@ -78,7 +108,7 @@ class TestMP4Executor:
         input_file = tmp_path / "input.mp4"
         output_file = tmp_path / "output.mp4"
 
-        cmd = executor._build_ffmpeg_command(input_file, output_file, 1, 3)
+        cmd = executor._build_ffmpeg_command(input_file, output_file, 1)
 
         assert cmd[0] == "/usr/bin/ffmpeg"
         assert "-i" in cmd
@@ -87,12 +117,10 @@ class TestMP4Executor:
         assert "0" in cmd
         assert "-c" in cmd
         assert "copy" in cmd
-        # Check dispositions for 3 tracks
-        assert "-disposition:a:0" in cmd
-        assert "0" in cmd  # Track 0 not default
-        assert "-disposition:a:1" in cmd
-        assert "default" in cmd  # Track 1 is default
-        assert "-disposition:a:2" in cmd
+        # All audio dispositions cleared, then track 1 marked default
+        clear = cmd.index("-disposition:a")
+        assert cmd[clear : clear + 4] == ["-disposition:a", "0", "-disposition:a:1", "default"]
+        assert "-disposition:a:0" not in cmd
         assert "-movflags" in cmd
         assert "+faststart" in cmd
         assert str(output_file) in cmd
@@ -105,7 +133,7 @@ class TestMP4Executor:
         # Mock ffprobe for track count
         mock_ffprobe = Mock(
             returncode=0,
-            stdout='{"streams": [{"codec_type": "audio"}, {"codec_type": "audio"}]}',
+            stdout="0\n1\n",
         )
 
         # Mock ffmpeg success
@@ -119,9 +147,9 @@ class TestMP4Executor:
             mock_run.side_effect = [mock_ffprobe, mock_ffmpeg]
 
             with patch("shutil.disk_usage", return_value=mock_stat):
-                with patch("shutil.copy2"):
+                with patch("arrtheaudio.core.executor._backup_atomic"):
                     # Create temp file to simulate ffmpeg output
-                    temp_file.write_bytes(b"0" * (9 * 1024 * 1024))  # 9 MB (90% of original)
+                    _sparse_file(temp_file, 9 * MiB)  # 90% of original
 
                     result = executor.set_default_audio(mock_file, 1)
 
@@ -147,7 +175,7 @@ class TestMP4Executor:
     def test_set_default_audio_no_audio_tracks(self, executor, mock_file):
         """Test processing file with no audio tracks."""
         # Mock ffprobe returning no audio streams
-        mock_ffprobe = Mock(returncode=0, stdout='{"streams": []}')
+        mock_ffprobe = Mock(returncode=0, stdout="")
 
         mock_stat = Mock()
         mock_stat.free = 100 * 1024 * 1024 * 1024
@@ -162,7 +190,7 @@ class TestMP4Executor:
         # Mock ffprobe returning 2 audio streams
         mock_ffprobe = Mock(
             returncode=0,
-            stdout='{"streams": [{"codec_type": "audio"}, {"codec_type": "audio"}]}',
+            stdout="0\n1\n",
         )
 
         mock_stat = Mock()
@@ -180,7 +208,7 @@ class TestMP4Executor:
         # Mock ffprobe success
         mock_ffprobe = Mock(
             returncode=0,
-            stdout='{"streams": [{"codec_type": "audio"}, {"codec_type": "audio"}]}',
+            stdout="0\n1\n",
         )
 
         # Mock ffmpeg failure
@@ -205,7 +233,7 @@ class TestMP4Executor:
         # Mock ffprobe success
         mock_ffprobe = Mock(
             returncode=0,
-            stdout='{"streams": [{"codec_type": "audio"}, {"codec_type": "audio"}]}',
+            stdout="0\n1\n",
         )
 
         # Mock ffmpeg success
@@ -219,7 +247,7 @@ class TestMP4Executor:
 
             with patch("shutil.disk_usage", return_value=mock_stat):
                 # Create temp file that's too small (< 90% of original)
-                temp_file.write_bytes(b"0" * (5 * 1024 * 1024))  # 5 MB (50% of original)
+                _sparse_file(temp_file, 5 * MiB)  # 50% of original
 
                 result = executor.set_default_audio(mock_file, 0)
 
@@ -231,7 +259,7 @@ class TestMP4Executor:
         # Mock ffprobe success
         mock_ffprobe = Mock(
             returncode=0,
-            stdout='{"streams": [{"codec_type": "audio"}, {"codec_type": "audio"}]}',
+            stdout="0\n1\n",
         )
 
         mock_stat = Mock()
@@ -255,7 +283,7 @@ class TestMP4Executor:
         # Mock ffprobe success
         mock_ffprobe = Mock(
             returncode=0,
-            stdout='{"streams": [{"codec_type": "audio"}, {"codec_type": "audio"}]}',
+            stdout="0\n1\n",
         )
 
         # Mock ffmpeg success
@@ -264,21 +292,16 @@ class TestMP4Executor:
         mock_stat = Mock()
         mock_stat.free = 100 * 1024 * 1024 * 1024
 
-        original_content = mock_file.read_bytes()
-
         with patch("subprocess.run") as mock_run:
             mock_run.side_effect = [mock_ffprobe, mock_ffmpeg]
 
             with patch("shutil.disk_usage", return_value=mock_stat):
-                with patch("shutil.copy2") as mock_copy:
-                    # First copy2 creates backup, second would restore
-                    mock_copy.side_effect = [None, None]
-
+                with patch("arrtheaudio.core.executor._backup_atomic"):
                     # Create temp file
-                    temp_file.write_bytes(b"0" * (9 * 1024 * 1024))
+                    _sparse_file(temp_file, 9 * MiB)
 
                     # Create backup
-                    backup_file.write_bytes(original_content)
+                    _sparse_file(backup_file, mock_file.stat().st_size)
 
                     # Mock replace to raise exception
                     with patch.object(Path, "replace", side_effect=Exception("Test error")):
@@ -288,6 +311,32 @@ class TestMP4Executor:
                         # Verify cleanup was attempted (files don't exist means cleanup worked)
                         assert not temp_file.exists()
 
+    def test_backup_atomic_hardlinks(self, tmp_path):
+        """Test backup survives the original being replaced."""
+        src = tmp_path / "test.mp4"
+        dst = tmp_path / "test.mp4.bak"
+        src.write_bytes(b"original")
+
+        _backup_atomic(src, dst)
+        (tmp_path / "new.mp4").write_bytes(b"remuxed")
+        (tmp_path / "new.mp4").replace(src)
+
+        assert dst.read_bytes() == b"original"
+        assert src.read_bytes() == b"remuxed"
+
+    def test_backup_atomic_copies_when_link_fails(self, tmp_path):
+        """Test backup falls back to a copy when hard linking is refused."""
+        src = tmp_path / "test.mp4"
+        dst = tmp_path / "test.mp4.bak"
+        src.write_bytes(b"original" * 1024)
+        dst.write_bytes(b"stale")
+
+        with patch("os.link", side_effect=OSError("cross-device link")):
+            _backup_atomic(src, dst)
+
+        assert dst.read_bytes() == src.read_bytes()
+        assert dst.stat().st_ino != src.stat().st_ino
+
     def test_cleanup_files(self, executor, tmp_path):
         """Test cleanup of temporary files."""
         temp1 = tmp_path / "temp1.tmp"
@@ -325,7 +374,7 @@ class TestMKVExecutor:
         with patch("subprocess.run") as mock_run:
             mock_run.return_value = Mock(
                 returncode=0,
-                stdout='{"streams": [{"codec_type": "audio"}, {"codec_type": "audio"}]}',
+                stdout="0\n1\n",
             )
 
             count = executor._get_audio_track_count(mock_file)
@@ -353,7 +402,15 @@ class TestGetExecutor:
         executor2 = get_executor("Mkv")
 
         assert isinstance(executor1, MKVExecutor)
-        assert isinstance(executor2, MKVExecutor)
+        assert executor2 is executor1  # Same cache key after normalizing case
+
+    def test_get_executor_cached_per_timeout(self):
+        """Test MP4 executors are shared per timeout, not across timeouts."""
+        with patch("shutil.which", return_value="/usr/bin/ffmpeg"):
+            executor = get_executor("mp4", timeout_seconds=120)
+
+            assert get_executor("MP4", timeout_seconds=120) is executor
+            assert get_executor("mp4", timeout_seconds=60).timeout_seconds == 60
 
     def test_get_executor_unsupported(self):
         """Test getting executor for unsupported format."""
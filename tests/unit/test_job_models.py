@@ -1,12 +1,22 @@
 """Unit tests for job models."""
 
-from datetime import datetime
+from dataclasses import FrozenInstanceError
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+
+import pytest
+
 from arrtheaudio.core.job_models import (
     Job,
     JobStatus,
     JobPriority,
     JobSource,
     BatchRequest,
+    PRIORITY_CODES,
+    SOURCE_CODES,
+    STATUS_CODES,
+    from_epoch_us,
+    to_epoch_us,
 )
 
 
@@ -66,12 +76,13 @@ class TestJobModel:
         assert db_dict["job_id"] == job.job_id
         assert db_dict["file_path"] == "/media/test.mkv"
         assert db_dict["container"] == "mkv"
-        assert db_dict["status"] == "queued"
-        assert db_dict["priority"] == "normal"
-        assert db_dict["source"] == "manual"
+        assert db_dict["status"] == 0  # Enum columns are stored as integer codes
+        assert db_dict["priority"] == 2
+        assert db_dict["source"] == 2
         assert db_dict["selected_track_index"] == 1
         assert db_dict["selected_track_language"] == "eng"
-        assert isinstance(db_dict["created_at"], str)
+        assert isinstance(db_dict["created_at"], int)  # Epoch microseconds
+        assert db_dict["started_at"] is None
 
     def test_job_from_db_dict(self):
         """Test creating job from database dictionary."""
@@ -79,16 +90,16 @@ class TestJobModel:
             "job_id": "job_test123",
             "file_path": "/media/test.mkv",
             "container": "mkv",
-            "status": "completed",
-            "priority": "high",
-            "source": "sonarr",
+            "status": 2,  # completed
+            "priority": 3,  # high
+            "source": 0,  # sonarr
             "webhook_id": "webhook_abc",
             "batch_id": None,
             "selected_track_index": 1,
             "selected_track_language": "eng",
-            "created_at": "2024-01-01T12:00:00",
-            "started_at": "2024-01-01T12:00:01",
-            "completed_at": "2024-01-01T12:00:02",
+            "created_at": 1704110400000000,  # 2024-01-01T12:00:00
+            "started_at": 1704110401000000,
+            "completed_at": 1704110402000000,
             "success": True,
             "error_message": None,
             "retry_count": 0,
@@ -109,28 +120,86 @@ class TestJobModel:
         assert isinstance(job.created_at, datetime)
         assert isinstance(job.started_at, datetime)
         assert isinstance(job.completed_at, datetime)
+        assert job.created_at == datetime(2024, 1, 1, 12, 0, 0)
         assert job.success is True
 
-    def test_job_status_enum(self):
-        """Test JobStatus enum values."""
-        assert JobStatus.QUEUED.value == "queued"
-        assert JobStatus.RUNNING.value == "running"
-        assert JobStatus.COMPLETED.value == "completed"
-        assert JobStatus.FAILED.value == "failed"
-        assert JobStatus.CANCELLED.value == "cancelled"
+    @pytest.mark.parametrize(
+        "value",
+        [
+            datetime(1970, 1, 1),
+            datetime(2024, 1, 1, 12, 0, 2, 250),
+            datetime(2038, 1, 19, 3, 14, 8, 999999),
+        ],
+        ids=str,
+    )
+    def test_epoch_us_round_trip(self, value):
+        """Test timestamps survive the epoch-microsecond encoding exactly."""
+        assert from_epoch_us(to_epoch_us(value)) == value
+
+    def test_to_epoch_us_converts_aware_datetimes(self):
+        """Test aware datetimes are stored as their UTC instant."""
+        aware = datetime(2024, 1, 1, 14, 0, tzinfo=timezone(timedelta(hours=2)))
+        assert to_epoch_us(aware) == to_epoch_us(datetime(2024, 1, 1, 12, 0))
+
+    @pytest.mark.parametrize(
+        "enum_val, expected_str",
+        [
+            (JobStatus.QUEUED, "queued"),
+            (JobStatus.RUNNING, "running"),
+            (JobStatus.COMPLETED, "completed"),
+            (JobStatus.FAILED, "failed"),
+            (JobStatus.CANCELLED, "cancelled"),
+            (JobPriority.HIGH, "high"),
+            (JobPriority.NORMAL, "normal"),
+            (JobPriority.LOW, "low"),
+            (JobSource.SONARR, "sonarr"),
+            (JobSource.RADARR, "radarr"),
+            (JobSource.MANUAL, "manual"),
+            (JobSource.RETRY, "retry"),
+        ],
+        ids=lambda v: f"{type(v).__name__}.{v.name}" if isinstance(v, Enum) else None,
+    )
+    def test_enum_values(self, enum_val, expected_str):
+        """Test JobStatus, JobPriority and JobSource enum values."""
+        assert enum_val.value == expected_str
+
+    def test_priority_codes_sort_high_first(self):
+        """Test priority codes descend from HIGH to LOW for ORDER BY priority DESC."""
+        ranked = sorted(JobPriority, key=lambda p: PRIORITY_CODES[p.value], reverse=True)
+        assert ranked == [JobPriority.HIGH, JobPriority.NORMAL, JobPriority.LOW]
+
+    @pytest.mark.parametrize(
+        "enum_cls, codes",
+        [(JobStatus, STATUS_CODES), (JobPriority, PRIORITY_CODES), (JobSource, SOURCE_CODES)],
+        ids=lambda v: v.__name__ if isinstance(v, type) else None,
+    )
+    def test_enum_codes_cover_enum(self, enum_cls, codes):
+        """Test every enum value has its own integer code."""
+        assert set(codes) == {member.value for member in enum_cls}
+        assert len(set(codes.values())) == len(codes)
+
+    def test_job_from_db_row_matches_from_db_dict(self):
+        """Test positional row loading builds the same job as dict loading."""
+        job = Job(
+            file_path="/media/test.mkv",
+            container="mkv",
+            source=JobSource.SONARR,
+            priority=JobPriority.HIGH,
+            status=JobStatus.COMPLETED,
+            webhook_id="webhook_abc",
+            completed_at=datetime(2024, 1, 1, 12, 0, 2),
+            success=True,
+            tmdb_id=12345,
+        )
+        db_dict = job.to_db_dict()
+        db_dict["success"] = 1  # SQLite stores booleans as integers
 
-    def test_job_priority_enum(self):
-        """Test JobPriority enum values."""
-        assert JobPriority.HIGH.value == "high"
-        assert JobPriority.NORMAL.value == "normal"
-        assert JobPriority.LOW.value == "low"
+        from_row = Job.from_db_row(tuple(db_dict.values()))
 
-    def test_job_source_enum(self):
-        """Test JobSource enum values."""
-        assert JobSource.SONARR.value == "sonarr"
-        assert JobSource.RADARR.value == "radarr"
-        assert JobSource.MANUAL.value == "manual"
-        assert JobSource.RETRY.value == "retry"
+        assert from_row == Job.from_db_dict(dict(db_dict))
+        assert from_row.success is True
+        assert from_row.status == JobStatus.COMPLETED
+        assert from_row.started_at is None
 
 
 class TestBatchRequest:
@@ -161,3 +230,10 @@ class TestBatchRequest:
         assert request.pattern == "*.mkv"
         assert request.dry_run is True
         assert request.priority == JobPriority.HIGH
+
+    def test_batch_request_is_immutable(self):
+        """Test BatchRequest fields cannot be reassigned."""
+        request = BatchRequest(path="/media/tv")
+
+        with pytest.raises(FrozenInstanceError):
+            request.path = "/media/movies"
@@ -7,66 +7,84 @@ import pytest
 from arrtheaudio.core.selector import PriorityResolver, TrackSelector
 from arrtheaudio.models.track import AudioTrack
 
+# Paths used across cases, built once at import
+MOVIE_PATH = Path("/media/movies/Movie.mkv")
+OFFICE_PATH = Path("/media/movies/The Office/S01E01.mkv")
+AOT_MOVIE_PATH = Path("/media/movies/AOT.mkv")
+ANIME_PATH = Path("/media/anime/Attack on Titan/S01E01.mkv")
+ANIME_SHOW_PATH = Path("/media/anime/Show/S01E01.mkv")
+KOREAN_PATH = Path("/media/korean/Squid Game/S01E01.mkv")
 
-class TestPriorityResolver:
-    """Test path-based priority resolution."""
-
-    def test_global_priority_when_no_override_matches(self, default_config):
-        """Should use global priority when no path override matches."""
-        resolver = PriorityResolver(default_config)
-        file_path = Path("/media/movies/The Office/S01E01.mkv")
-
-        priority = resolver.resolve_priority(file_path)
-
-        assert priority == ["eng", "jpn", "ita"]
-
-    def test_path_override_for_anime(self, default_config):
-        """Should use anime-specific priority for anime paths."""
-        resolver = PriorityResolver(default_config)
-        file_path = Path("/media/anime/Attack on Titan/S01E01.mkv")
 
-        priority = resolver.resolve_priority(file_path)
+@pytest.fixture(scope="class")
+def resolver(default_config):
+    """Create a priority resolver (stateless, shared by the class)."""
+    return PriorityResolver(default_config)
 
-        assert priority == ["jpn", "eng"]
 
-    def test_path_override_for_korean(self, default_config):
-        """Should use Korean-specific priority for Korean paths."""
-        resolver = PriorityResolver(default_config)
-        file_path = Path("/media/korean/Squid Game/S01E01.mkv")
+@pytest.fixture(scope="class")
+def selector(default_config):
+    """Create a track selector (stateless, shared by the class)."""
+    return TrackSelector(default_config)
 
-        priority = resolver.resolve_priority(file_path)
 
-        assert priority == ["kor", "eng"]
-
-    def test_first_matching_override_wins(self, default_config):
-        """Should use first matching override pattern."""
-        resolver = PriorityResolver(default_config)
-
-        # This matches the anime pattern (first in list)
-        file_path = Path("/media/anime/Show/S01E01.mkv")
-        priority = resolver.resolve_priority(file_path)
+class TestPriorityResolver:
+    """Test path-based priority resolution."""
 
-        assert priority == ["jpn", "eng"]
+    @pytest.mark.parametrize(
+        "file_path, expected",
+        [
+            # No override matches: global priority
+            (OFFICE_PATH, ["eng", "jpn", "ita"]),
+            # Each path override applies its own priority
+            (ANIME_PATH, ["jpn", "eng"]),
+            (KOREAN_PATH, ["kor", "eng"]),
+            # Matches the anime pattern, which is first in the list
+            (ANIME_SHOW_PATH, ["jpn", "eng"]),
+        ],
+        ids=["global", "anime", "korean", "first-override-wins"],
+    )
+    def test_resolve_priority(self, resolver, file_path, expected):
+        """Should use the first matching path override, else the global priority."""
+        assert resolver.resolve_priority(file_path) == expected
 
 
 class TestTrackSelector:
     """Test track selection logic."""
 
-    def test_select_original_language_when_available(
-        self, default_config, sample_audio_tracks, sample_metadata_jpn
+    @pytest.mark.parametrize(
+        "file_path, metadata, expected_language, expected_index",
+        [
+            # Original language is preferred when known and available
+            (AOT_MOVIE_PATH, "sample_metadata_jpn", "jpn", 1),
+            # No metadata: first available from the global priority
+            (MOVIE_PATH, "sample_metadata_none", "eng", 0),
+            # No metadata on an anime path: anime priority
+            (ANIME_SHOW_PATH, None, "jpn", 1),
+        ],
+        ids=["original-language", "global-priority", "path-priority"],
+    )
+    def test_select_from_sample_tracks(
+        self,
+        request,
+        selector,
+        sample_audio_tracks,
+        file_path,
+        metadata,
+        expected_language,
+        expected_index,
     ):
-        """Should prefer original language when known and available."""
-        selector = TrackSelector(default_config)
-        file_path = Path("/media/movies/AOT.mkv")
+        """Should pick the track by original language, then path/global priority."""
+        metadata = request.getfixturevalue(metadata) if metadata else None
 
-        selected = selector.select(sample_audio_tracks, file_path, sample_metadata_jpn)
+        selected = selector.select(sample_audio_tracks, file_path, metadata)
 
         assert selected is not None
-        assert selected.language == "jpn"
-        assert selected.index == 1
+        assert selected.language == expected_language
+        assert selected.index == expected_index
 
     def test_fallback_to_priority_when_original_not_available(
-        self, default_config, sample_metadata_eng
+        self, selector, sample_metadata_eng
     ):
         """Should use priority list when original language not in tracks."""
         # Tracks without English
@@ -75,52 +93,20 @@ class TestTrackSelector:
             AudioTrack(1, 2, "ac3", "ita", is_default=False),
         ]
 
-        selector = TrackSelector(default_config)
-        file_path = Path("/media/movies/Movie.mkv")
-
         # Original is "eng" but not available, should pick first from priority
-        selected = selector.select(tracks, file_path, sample_metadata_eng)
+        selected = selector.select(tracks, MOVIE_PATH, sample_metadata_eng)
 
         # Should pick "jpn" (first available from priority list)
         assert selected is not None
         assert selected.language == "jpn"
 
-    def test_use_priority_when_no_metadata(
-        self, default_config, sample_audio_tracks, sample_metadata_none
-    ):
-        """Should use priority list when no metadata available."""
-        selector = TrackSelector(default_config)
-        file_path = Path("/media/movies/Movie.mkv")
-
-        selected = selector.select(sample_audio_tracks, file_path, sample_metadata_none)
-
-        # Should pick "eng" (first in global priority)
-        assert selected is not None
-        assert selected.language == "eng"
-        assert selected.index == 0
-
-    def test_use_path_specific_priority(self, default_config, sample_audio_tracks):
-        """Should use path-specific priority for anime files."""
-        selector = TrackSelector(default_config)
-        file_path = Path("/media/anime/Show/S01E01.mkv")
-
-        selected = selector.select(sample_audio_tracks, file_path, None)
-
-        # Should pick "jpn" (first in anime priority)
-        assert selected is not None
-        assert selected.language == "jpn"
-        assert selected.index == 1
-
-    def test_return_none_when_no_tracks(self, default_config):
+    def test_return_none_when_no_tracks(self, selector):
         """Should return None when no tracks available."""
-        selector = TrackSelector(default_config)
-        file_path = Path("/media/movies/Movie.mkv")
-
-        selected = selector.select([], file_path, None)
+        selected = selector.select([], MOVIE_PATH, None)
 
         assert selected is None
 
-    def test_return_none_when_no_matching_language(self, default_config):
+    def test_return_none_when_no_matching_language(self, selector):
         """Should return None when no matching language found."""
         # Tracks with only languages not in priority
         tracks = [
@@ -128,9 +114,6 @@ class TestTrackSelector:
             AudioTrack(1, 2, "ac3", "ger", is_default=False),
         ]
 
-        selector = TrackSelector(default_config)
-        file_path = Path("/media/movies/Movie.mkv")
-
-        selected = selector.select(tracks, file_path, None)
+        selected = selector.select(tracks, MOVIE_PATH, None)
 
         assert selected is None